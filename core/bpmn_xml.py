@@ -23,6 +23,9 @@ _ARRAY_TAG_DEFAULTS = {
     "sequences": "sequenceFlow",
 }
 
+# 루트 요소 앞부분의 xmlns 선언(기본/접두사) — 매 병합마다 다시 컴파일하지 않는다.
+_XMLNS_DECL_RE = re.compile(r'xmlns(:[A-Za-z0-9_.-]+)?="([^"]+)"')
+
 
 def _local_name(tag: str) -> str:
     return tag.rsplit("}", 1)[-1]
@@ -34,7 +37,7 @@ def _namespace_of(tag: str) -> str:
 
 def _register_namespaces(xml_text: str) -> None:
     head = xml_text[:2000]
-    for prefix, uri in re.findall(r'xmlns(:[A-Za-z0-9_.-]+)?="([^"]+)"', head):
+    for prefix, uri in _XMLNS_DECL_RE.findall(head):
         ET.register_namespace(prefix.lstrip(":"), uri)
 
 
@@ -47,11 +50,15 @@ def _find_process_element(root: ET.Element) -> Optional[ET.Element]:
     return None
 
 
-def _find_by_id(root: ET.Element, element_id: str) -> Optional[ET.Element]:
+def _index_by_id(root: ET.Element) -> Dict[str, ET.Element]:
+    """트리 전체를 한 번만 순회해 id → 요소 맵을 만든다. 같은 id가 여러 번 나오면
+    문서 순서상 첫 요소를 쓴다(개별 탐색 시 먼저 만나는 요소와 같다)."""
+    index: Dict[str, ET.Element] = {}
     for el in root.iter():
-        if el.get("id") == element_id:
-            return el
-    return None
+        el_id = el.get("id")
+        if el_id:
+            index.setdefault(el_id, el)
+    return index
 
 
 def _diff_by_id(live_list: Optional[List[Dict[str, Any]]], merged_list: Optional[List[Dict[str, Any]]]):
@@ -75,11 +82,13 @@ def _documentation_text(element: Dict[str, Any], skip_keys) -> str:
     return " / ".join(f"{k}: {v}" for k, v in element.items() if k not in skip_keys and v)
 
 
-def _template_tag_for(root: ET.Element, live_list: Optional[List[Dict[str, Any]]]) -> Optional[str]:
+def _template_tag_for(
+    elements_by_id: Dict[str, ET.Element], live_list: Optional[List[Dict[str, Any]]]
+) -> Optional[str]:
     for existing in live_list or []:
         if not isinstance(existing, dict) or not existing.get("id"):
             continue
-        existing_el = _find_by_id(root, existing["id"])
+        existing_el = elements_by_id.get(existing["id"])
         if existing_el is not None:
             return existing_el.tag
     return None
@@ -149,13 +158,23 @@ def merge_process_definition_artifact_into_xml(
 
     fallback_ns = _namespace_of(process_el.tag)
 
-    for array_key in ("activities", "sequences", "gateways"):
-        new_items, changed_items = _diff_by_id(
-            live_definition.get(array_key), merged_definition.get(array_key)
-        )
+    diffs = {
+        array_key: _diff_by_id(live_definition.get(array_key), merged_definition.get(array_key))
+        for array_key in ("activities", "sequences", "gateways")
+    }
+    has_changes = any(new_items or changed_items for new_items, changed_items in diffs.values())
+
+    # 변경 요소/템플릿 조회마다 트리 전체를 다시 훑지 않도록 id 인덱스를 한 번만 만든다
+    # (반영할 변경이 없으면 만들지 않는다). 여기서 새로 추가하는 요소는 조회 대상이
+    # 아니므로(조회는 라이브 id만) 갱신하지 않는다.
+    elements_by_id = _index_by_id(root) if has_changes else {}
+
+    for array_key, (new_items, changed_items) in diffs.items():
+        if not new_items and not changed_items:
+            continue
 
         for element in changed_items:
-            target_el = _find_by_id(root, element["id"])
+            target_el = elements_by_id.get(element["id"])
             if target_el is None:
                 new_items.append(element)
                 continue
@@ -165,7 +184,7 @@ def merge_process_definition_artifact_into_xml(
             elif element.get("name"):
                 target_el.set("name", element["name"])
 
-        template_tag = _template_tag_for(root, live_definition.get(array_key))
+        template_tag = _template_tag_for(elements_by_id, live_definition.get(array_key))
         for element in new_items:
             _append_new_element(process_el, array_key, element, template_tag, fallback_ns)
 
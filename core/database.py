@@ -1,11 +1,18 @@
+import asyncio
+import copy
 import os
-import socket
+import re
 import random
 import string
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
 from typing import Optional, Dict, Any, List
 from dotenv import load_dotenv
 from supabase import create_client, Client
 from utils.logger import handle_error, log
+from core.dmn_xml import xml_to_dmn_decisions_rules
 
 # ============================================================================
 # DB 설정 및 초기화
@@ -39,10 +46,11 @@ async def fetch_feedback_task(limit: int = 1) -> Optional[Dict[str, Any]]:
     """DONE 상태이면서 feedback이 있는 작업 조회"""
     try:
         supabase = get_db_client()
-        resp = supabase.rpc(
+        query = supabase.rpc(
             'agent_feedback_task',
             {'p_limit': limit}
-        ).execute()
+        )
+        resp = await asyncio.to_thread(query.execute)
         rows = resp.data or []
         return rows[0] if rows else None
     except Exception as e:
@@ -52,14 +60,14 @@ async def fetch_feedback_task_by_id(todo_id: str) -> Optional[Dict[str, Any]]:
     """특정 ID의 피드백 작업 조회 (테스트용)"""
     try:
         supabase = get_db_client()
-        resp = (
+        query = (
             supabase
             .table('todolist')
             .select('*')
             .eq('id', todo_id)
             .single()
-            .execute()
         )
+        resp = await asyncio.to_thread(query.execute)
         return resp.data if resp.data else None
     except Exception as e:
         handle_error("특정피드백작업조회", e)
@@ -80,20 +88,46 @@ async def fetch_events_by_todo_id(todo_id: str) -> List[Dict[str, Any]]:
     """
     try:
         supabase = get_db_client()
-        resp = (
+        query = (
             supabase
             .table("events")
             .select("*")
             .eq("todo_id", todo_id)
             .order("timestamp", desc=False)
-            .execute()
         )
+        resp = await asyncio.to_thread(query.execute)
         return resp.data or []
     except Exception as e:
         handle_error("이벤트로그조회", e)
         return []
 
 
+async def fetch_events_by_todo_ids(todo_ids: List[str], limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """여러 TODO(ID)의 이벤트 로그를 한 번의 쿼리로 시간순 조회 (배치 승인 처리용).
+
+    워크아이템마다 fetch_events_by_todo_id를 부르는 대신 todo_id IN (...)으로 한 번에
+    가져온다. limit을 주면 배치 전체에서 최신 limit건만 DB에서 잘라 가져온다.
+    """
+    if not todo_ids:
+        return []
+    try:
+        supabase = get_db_client()
+        query = (
+            supabase
+            .table("events")
+            .select("*")
+            .in_("todo_id", todo_ids)
+        )
+        if limit:
+            resp = await asyncio.to_thread(query.order("timestamp", desc=True).limit(limit).execute)
+            return list(reversed(resp.data or []))
+        resp = await asyncio.to_thread(query.order("timestamp", desc=False).execute)
+        return resp.data or []
+    except Exception as e:
+        handle_error("이벤트로그일괄조회", e)
+        return []
+
+
 # ============================================================================
 # 피드백 상태 업데이트
 # ============================================================================
@@ -111,19 +145,43 @@ async def update_feedback_status(todo_id: str, status: str) -> bool:
     """
     try:
         supabase = get_db_client()
-        resp = (
+        query = (
             supabase
             .table('todolist')
             .update({'feedback_status': status})
             .eq('id', todo_id)
-            .execute()
         )
+        await asyncio.to_thread(query.execute)
         return True
     except Exception as e:
         handle_error("피드백상태업데이트", e)
         return False
 
 
+async def update_feedback_status_bulk(todo_ids: List[str], status: str) -> bool:
+    """
+    여러 피드백 작업의 상태를 한 번의 UPDATE로 갱신 (id IN (...))
+
+    배치 단위로 같은 상태를 기록할 때 todo마다 update_feedback_status를 부르지 않도록 한다.
+    """
+    ids = list(dict.fromkeys(t for t in todo_ids if t))
+    if not ids:
+        return True
+    try:
+        supabase = get_db_client()
+        query = (
+            supabase
+            .table('todolist')
+            .update({'feedback_status': status})
+            .in_('id', ids)
+        )
+        await asyncio.to_thread(query.execute)
+        return True
+    except Exception as e:
+        handle_error("피드백상태일괄업데이트", e)
+        return False
+
+
 def extract_new_feedback_items(feedback_raw: Any, collected_count: int) -> List[tuple]:
     """feedback 배열에서 아직 수집하지 않은(collected_count 이후의) 항목들을 시간순으로 반환.
 
@@ -166,7 +224,8 @@ async def mark_feedback_collected_count(todo_id: str, count: int) -> bool:
     """
     try:
         supabase = get_db_client()
-        supabase.table('todolist').update({'feedback_collected_count': count}).eq('id', todo_id).execute()
+        query = supabase.table('todolist').update({'feedback_collected_count': count}).eq('id', todo_id)
+        await asyncio.to_thread(query.execute)
         return True
     except Exception as e:
         handle_error("피드백수집개수갱신", e)
@@ -176,14 +235,46 @@ async def mark_feedback_collected_count(todo_id: str, count: int) -> bool:
 # ============================================================================
 # 에이전트 정보 조회
 # ============================================================================
+# 에이전트 정보(users 행)는 거의 바뀌지 않는데 피드백/배치 처리마다 반복 조회되므로
+# 짧게 캐시한다. 스레드(asyncio.to_thread)에서도 호출되므로 락으로 보호하고, 이 모듈이
+# users.skills를 갱신하면 해당 에이전트 항목을 무효화한다. 조회 실패(None)는 캐시하지 않는다.
+_AGENT_CACHE_TTL_SECONDS = 60.0
+_AGENT_CACHE_MAX_ENTRIES = 1024
+_agent_cache: "OrderedDict[str, tuple]" = OrderedDict()
+_agent_cache_lock = threading.Lock()
+
+# 에이전트 조회 시 실제로 쓰는 컬럼만 가져온다 (프롬프트용 이름/역할/목표, 스킬 동기화용
+# tenant_id/skills, 에이전트 판별용 is_agent/agent_type).
+_AGENT_COLUMNS = 'id, username, role, goal, tenant_id, skills, is_agent, agent_type'
+
+
+def _invalidate_agent_cache(agent_id: str) -> None:
+    with _agent_cache_lock:
+        _agent_cache.pop(agent_id, None)
+
+
 def _get_agent_by_id(agent_id: str) -> Optional[Dict[str, Any]]:
     """ID로 에이전트 조회"""
+    now = time.monotonic()
+    with _agent_cache_lock:
+        cached = _agent_cache.get(agent_id)
+        if cached is not None:
+            expires_at, agent = cached
+            if expires_at > now:
+                _agent_cache.move_to_end(agent_id)
+                return dict(agent)
+            _agent_cache.pop(agent_id, None)
+
     supabase = get_db_client()
-    resp = supabase.table('users').select('*').eq('id', agent_id).execute()
+    resp = supabase.table('users').select(_AGENT_COLUMNS).eq('id', agent_id).execute()
     if resp.data and resp.data[0].get('is_agent') and resp.data[0].get('agent_type') == 'agent':
         agent = resp.data[0]
-        print('에이전트 이름: ', agent.get('username'))
         agent['name'] = agent['username']
+        with _agent_cache_lock:
+            _agent_cache[agent_id] = (time.monotonic() + _AGENT_CACHE_TTL_SECONDS, dict(agent))
+            _agent_cache.move_to_end(agent_id)
+            while len(_agent_cache) > _AGENT_CACHE_MAX_ENTRIES:
+                _agent_cache.popitem(last=False)
         return agent
     return None
 
@@ -192,7 +283,7 @@ def get_all_agents() -> List[Dict[str, Any]]:
     supabase = get_db_client()
     resp = (
         supabase.table('users')
-        .select('*')
+        .select(_AGENT_COLUMNS)
         .eq('is_agent', True)
         .eq('agent_type', 'agent')
         .execute()
@@ -209,16 +300,20 @@ def get_all_agents() -> List[Dict[str, Any]]:
 # 스킬 동기화 (users / tenants 테이블)
 # ============================================================================
 
+# 콤마와 그 앞뒤 공백을 한 번에 구분자로 잘라, 항목마다 strip을 다시 하지 않는다.
+_SKILL_SPLIT_RE = re.compile(r"\s*,\s*")
+
+
 def _parse_comma_separated_skills(skills_text: Optional[str]) -> List[str]:
     """콤마로 조인된 스킬 문자열을 리스트로 변환."""
     if not skills_text:
         return []
-    return [s.strip() for s in skills_text.split(",") if s.strip()]
+    return [s for s in _SKILL_SPLIT_RE.split(skills_text.strip()) if s]
 
 
 def _join_comma_separated_skills(skills_list: List[str]) -> str:
-    """스킬 리스트를 콤마로 조인된 문자열로 변환."""
-    return ",".join(sorted(set(skills_list)))
+    """스킬 리스트를 콤마로 조인된 문자열로 변환 (중복 제거, 기존 순서 유지)."""
+    return ",".join(dict.fromkeys(skills_list))
 
 
 def update_agent_and_tenant_skills(agent_id: str, skill_name: str, operation: str) -> None:
@@ -228,11 +323,38 @@ def update_agent_and_tenant_skills(agent_id: str, skill_name: str, operation: st
     - users.skills: 스킬명을 콤마(,)로 조인한 문자열
     - tenants.skills: 스킬명 문자열 배열 (text[])
     """
-    from utils.logger import log  # 순환 import 방지용 내부 import
+    update_agent_and_tenant_skills_bulk(agent_id, [skill_name], operation)
 
-    supabase = get_db_client()
 
-    # 1) 에이전트 정보 조회 (tenant_id, 기존 skills 포함)
+# users 조회에 tenants 행을 외래키 임베드로 함께 받아 tenants 조회 왕복을 줄인다.
+# users_tenant_id_fkey는 Postgres 기본 외래키 이름을 가정한 것이다. 관계를 찾지 못하거나
+# 모호하면(PGRST200/PGRST201) PostgREST가 요청 전체를 거절하므로, 그때만 이후 조회에서
+# 임베드를 끈다(tenants는 호출부가 따로 조회). 그 밖의 오류(행 없음, 네트워크 등)는
+# 임베드와 무관하므로 그대로 올린다.
+_USERS_TENANT_EMBED = "tenants!users_tenant_id_fkey(id, skills)"
+_EMBED_RELATIONSHIP_ERROR_CODES = ("PGRST200", "PGRST201")
+_users_tenant_embed_enabled = True
+
+
+def _fetch_user_with_tenant(supabase: Client, agent_id: str) -> Optional[Dict[str, Any]]:
+    """users 행(id, tenant_id, skills)을 조회한다. 임베드가 되면 "tenants" 키에 tenants 행이 담긴다."""
+    global _users_tenant_embed_enabled
+    if _users_tenant_embed_enabled:
+        try:
+            resp = (
+                supabase.table("users")
+                .select(f"id, tenant_id, skills, {_USERS_TENANT_EMBED}")
+                .eq("id", agent_id)
+                .single()
+                .execute()
+            )
+            return resp.data if resp.data else None
+        except Exception as e:
+            if getattr(e, "code", None) not in _EMBED_RELATIONSHIP_ERROR_CODES:
+                raise
+            _users_tenant_embed_enabled = False
+            log(f"⚠️ users→tenants 관계를 찾지 못해 임베드 없이 조회로 전환: {e}")
+
     resp = (
         supabase.table("users")
         .select("id, tenant_id, skills")
@@ -240,7 +362,25 @@ def update_agent_and_tenant_skills(agent_id: str, skill_name: str, operation: st
         .single()
         .execute()
     )
-    user = resp.data if resp.data else None
+    return resp.data if resp.data else None
+
+
+def update_agent_and_tenant_skills_bulk(agent_id: str, skill_names: List[str], operation: str) -> None:
+    """
+    여러 스킬을 한 번에 users.skills / tenants.skills / agent_skills에 동기화.
+
+    스킬마다 update_agent_and_tenant_skills를 부르면 스킬 수만큼 users/tenants 조회·갱신과
+    agent_skills 쓰기가 반복된다. 여기서는 조회·갱신을 한 번씩만 하고 agent_skills는
+    행 배열 upsert(또는 skill_name IN 삭제) 한 번으로 처리한다.
+    """
+    names = [name for name in dict.fromkeys(skill_names) if name]
+    if not names:
+        return
+
+    supabase = get_db_client()
+
+    # 1) 에이전트 정보 조회 (tenant_id, 기존 skills 포함)
+    user = _fetch_user_with_tenant(supabase, agent_id)
     if not user:
         log(f"에이전트를 찾을 수 없습니다 (users.skills 업데이트 생략): agent_id={agent_id}")
         return
@@ -248,74 +388,88 @@ def update_agent_and_tenant_skills(agent_id: str, skill_name: str, operation: st
     tenant_id = user.get("tenant_id")
     user_skills_text: Optional[str] = user.get("skills")
     user_skills = _parse_comma_separated_skills(user_skills_text)
+    original_user_skills = list(user_skills)
 
     operation_upper = (operation or "").upper()
 
-    # 2) users.skills 업데이트
+    # 2) users.skills 업데이트 (순서는 리스트로 유지하고 포함 여부만 set으로 확인)
     if operation_upper == "CREATE":
-        if skill_name not in user_skills:
-            user_skills.append(skill_name)
+        present = set(user_skills)
+        user_skills.extend(name for name in names if name not in present)
     elif operation_upper == "DELETE":
-        user_skills = [s for s in user_skills if s != skill_name]
-
-    new_user_skills_text = _join_comma_separated_skills(user_skills) if user_skills else None
+        removed = set(names)
+        user_skills = [s for s in user_skills if s not in removed]
 
-    supabase.table("users").update(
-        {"skills": new_user_skills_text}
-    ).eq("id", agent_id).execute()
-    log(f"users.skills 업데이트 완료: agent_id={agent_id}, skills={new_user_skills_text}")
+    # 이미 반영돼 있으면(재부착/중복 삭제 등) 같은 값을 다시 쓰는 UPDATE를 생략한다.
+    if user_skills != original_user_skills:
+        new_user_skills_text = _join_comma_separated_skills(user_skills) if user_skills else None
+        try:
+            supabase.table("users").update(
+                {"skills": new_user_skills_text}
+            ).eq("id", agent_id).execute()
+        finally:
+            # 요청이 실패로 끝나도 서버에는 반영됐을 수 있으므로 항상 캐시를 비운다.
+            _invalidate_agent_cache(agent_id)
+        log(f"users.skills 업데이트 완료: agent_id={agent_id}, skills={new_user_skills_text}")
 
     # 3) tenants.skills 업데이트 (tenant_id 기준)
     if not tenant_id:
         log(f"tenant_id가 없어 tenants.skills 업데이트를 건너뜁니다: agent_id={agent_id}")
         return
 
-    tenant_resp = (
-        supabase.table("tenants")
-        .select("id, skills")
-        .eq("id", tenant_id)
-        .single()
-        .execute()
-    )
-    tenant = tenant_resp.data if tenant_resp.data else None
+    tenant = user.get("tenants")
+    if not tenant:
+        tenant_resp = (
+            supabase.table("tenants")
+            .select("id, skills")
+            .eq("id", tenant_id)
+            .single()
+            .execute()
+        )
+        tenant = tenant_resp.data if tenant_resp.data else None
     if not tenant:
         log(f"tenant를 찾을 수 없습니다 (tenants.skills 업데이트 생략): tenant_id={tenant_id}")
         return
 
     tenant_skills: Optional[list] = tenant.get("skills")  # text[] → Python list
     tenant_skills_list: List[str] = list(tenant_skills) if tenant_skills else []
+    original_tenant_skills = list(tenant_skills_list)
 
     if operation_upper == "CREATE":
-        if skill_name not in tenant_skills_list:
-            tenant_skills_list.append(skill_name)
+        present = set(tenant_skills_list)
+        tenant_skills_list.extend(name for name in names if name not in present)
     elif operation_upper == "DELETE":
-        tenant_skills_list = [s for s in tenant_skills_list if s != skill_name]
-
-    supabase.table("tenants").update(
-        {"skills": tenant_skills_list if tenant_skills_list else None}
-    ).eq("id", tenant_id).execute()
+        removed = set(names)
+        tenant_skills_list = [s for s in tenant_skills_list if s not in removed]
 
-    log(f"tenants.skills 업데이트 완료: tenant_id={tenant_id}, skills={tenant_skills_list}")
+    if tenant_skills_list != original_tenant_skills:
+        supabase.table("tenants").update(
+            {"skills": tenant_skills_list if tenant_skills_list else None}
+        ).eq("id", tenant_id).execute()
+        log(f"tenants.skills 업데이트 완료: tenant_id={tenant_id}, skills={tenant_skills_list}")
 
     # 4) agent_skills 테이블 동기화 (user_id, tenant_id, skill_name)
     if tenant_id:
         try:
             if operation_upper == "CREATE":
                 supabase.table("agent_skills").upsert(
-                    {"user_id": agent_id, "tenant_id": tenant_id, "skill_name": skill_name},
+                    [
+                        {"user_id": agent_id, "tenant_id": tenant_id, "skill_name": name}
+                        for name in names
+                    ],
                     on_conflict="user_id,tenant_id,skill_name",
                 ).execute()
-                log(f"agent_skills INSERT 완료: agent_id={agent_id}, skill_name={skill_name}")
+                log(f"agent_skills INSERT 완료: agent_id={agent_id}, skill_names={names}")
             elif operation_upper == "DELETE":
                 (
                     supabase.table("agent_skills")
                     .delete()
                     .eq("user_id", agent_id)
                     .eq("tenant_id", tenant_id)
-                    .eq("skill_name", skill_name)
+                    .in_("skill_name", names)
                     .execute()
                 )
-                log(f"agent_skills DELETE 완료: agent_id={agent_id}, skill_name={skill_name}")
+                log(f"agent_skills DELETE 완료: agent_id={agent_id}, skill_names={names}")
         except Exception as e:
             log(f"⚠️ agent_skills 동기화 실패 (무시하고 계속 진행): {e}")
             handle_error("agent_skills동기화", e)
@@ -331,7 +485,8 @@ async def fetch_todolist_rows_by_ids(todo_ids: List[str]) -> List[Dict[str, Any]
         return []
     try:
         supabase = get_db_client()
-        resp = supabase.table("todolist").select("*").in_("id", todo_ids).execute()
+        query = supabase.table("todolist").select("*").in_("id", todo_ids)
+        resp = await asyncio.to_thread(query.execute)
         return resp.data or []
     except Exception as e:
         handle_error("todolist재조회", e)
@@ -353,7 +508,7 @@ async def append_feedback_to_batch(
     """
     try:
         supabase = get_db_client()
-        resp = supabase.rpc(
+        query = supabase.rpc(
             "append_feedback_to_batch",
             {
                 "p_tenant_id": tenant_id,
@@ -364,7 +519,8 @@ async def append_feedback_to_batch(
                 "p_time": time,
                 "p_user_id": user_id,
             },
-        ).execute()
+        )
+        resp = await asyncio.to_thread(query.execute)
         data = resp.data
         if isinstance(data, list):
             return data[0] if data else None
@@ -374,22 +530,57 @@ async def append_feedback_to_batch(
         return None
 
 
-async def fetch_collecting_batches(tenant_id: str = "") -> List[Dict[str, Any]]:
-    """트리거 조건 확인 대상인 COLLECTING 배치 전체를 가져온다"""
-    try:
-        supabase = get_db_client()
-        query = supabase.table("feedback_proposals").select("*").eq("status", "COLLECTING")
-        if tenant_id:
-            query = query.eq("tenant_id", tenant_id)
-        resp = query.execute()
-        return resp.data or []
-    except Exception as e:
-        handle_error("COLLECTING배치조회", e)
-        return []
+# feedback_proposals 목록 조회 시 한 번에 가져올 행 수. PostgREST는 응답 행 수를
+# max-rows(Supabase 기본 1000)로 조용히 자르므로, 그보다 작은 페이지로 .range 조회한다.
+_BATCH_PAGE_SIZE = 500
+
+
+def _fetch_all_pages(build_query, page_size: int = _BATCH_PAGE_SIZE) -> List[Dict[str, Any]]:
+    """build_query()가 만드는 (정렬된) 쿼리를 .range 페이지 단위로 끝까지 조회한다.
+
+    쿼리 빌더는 체이닝 시 자신을 변경하므로 페이지마다 build_query()로 새로 만든다.
+    """
+    rows: List[Dict[str, Any]] = []
+    start = 0
+    while True:
+        resp = build_query().range(start, start + page_size - 1).execute()
+        page = resp.data or []
+        rows.extend(page)
+        if len(page) < page_size:
+            return rows
+        start += page_size
+
+
+async def iter_collecting_batch_pages(tenant_id: str = "", page_size: int = _BATCH_PAGE_SIZE):
+    """COLLECTING 배치를 id 기준 keyset 페이지(id > 직전 페이지 마지막 id) 단위로 내준다.
+
+    호출부가 한 페이지를 처리하는 동안 배치가 PROPOSED/DISCARDED로 바뀌어 COLLECTING 집합에서
+    빠지므로, offset(.range) 페이징을 쓰면 뒤 페이지가 밀려 일부 배치를 건너뛴다.
+    """
+    last_id = None
+    while True:
+        try:
+            supabase = get_db_client()
+            query = supabase.table("feedback_proposals").select("*").eq("status", "COLLECTING")
+            if tenant_id:
+                query = query.eq("tenant_id", tenant_id)
+            if last_id is not None:
+                query = query.gt("id", last_id)
+            resp = await asyncio.to_thread(query.order("id").limit(page_size).execute)
+        except Exception as e:
+            handle_error("COLLECTING배치조회", e)
+            return
+        page = resp.data or []
+        if not page:
+            return
+        yield page
+        if len(page) < page_size:
+            return
+        last_id = page[-1]["id"]
 
 
 def _now_iso() -> str:
-    from datetime import datetime, timezone
+    """현재 시각(UTC, timezone 포함) ISO 문자열 — 정렬 기준 컬럼(proposed_at 등)에 쓴다."""
     return datetime.now(timezone.utc).isoformat()
 
 
@@ -428,7 +619,7 @@ async def mark_batch_proposed(
             }
             for t in targets
         ]
-        resp = (
+        query = (
             supabase.table("feedback_proposals")
             .update({
                 "status": "PROPOSED",
@@ -438,8 +629,8 @@ async def mark_batch_proposed(
             })
             .eq("id", batch_id)
             .eq("status", "COLLECTING")
-            .execute()
         )
+        resp = await asyncio.to_thread(query.execute)
         return bool(resp.data)
     except Exception as e:
         handle_error("배치PROPOSED전환", e)
@@ -450,13 +641,13 @@ async def mark_batch_discarded(batch_id: str) -> bool:
     """공통 규칙 없음 판정 시 COLLECTING → DISCARDED로 전환"""
     try:
         supabase = get_db_client()
-        resp = (
+        query = (
             supabase.table("feedback_proposals")
             .update({"status": "DISCARDED"})
             .eq("id", batch_id)
             .eq("status", "COLLECTING")
-            .execute()
         )
+        resp = await asyncio.to_thread(query.execute)
         return bool(resp.data)
     except Exception as e:
         handle_error("배치DISCARDED전환", e)
@@ -467,22 +658,49 @@ async def fetch_proposed_batches(tenant_id: str = "") -> List[Dict[str, Any]]:
     """사용자 승인/반려 대기 중인 제안(PROPOSED) 목록을 가져온다"""
     try:
         supabase = get_db_client()
-        query = supabase.table("feedback_proposals").select("*").eq("status", "PROPOSED")
-        if tenant_id:
-            query = query.eq("tenant_id", tenant_id)
-        resp = query.order("proposed_at", desc=True).execute()
-        return resp.data or []
+
+        def _query():
+            query = supabase.table("feedback_proposals").select("*").eq("status", "PROPOSED")
+            if tenant_id:
+                query = query.eq("tenant_id", tenant_id)
+            return query.order("proposed_at", desc=True).order("id")
+
+        return await asyncio.to_thread(_fetch_all_pages, _query)
     except Exception as e:
         handle_error("PROPOSED배치조회", e)
         return []
 
 
+# RESOLVED/DISCARDED 배치는 더 이상 상태가 바뀌지 않으므로 상세 조회 결과를 잠시 재사용한다.
+# 진행 중(COLLECTING/PROPOSED) 배치는 승인/반려 판단에 최신 상태가 필요하므로 캐시하지 않는다.
+_TERMINAL_BATCH_STATUSES = frozenset({"RESOLVED", "DISCARDED"})
+_BATCH_CACHE_TTL_SECONDS = 300.0
+_BATCH_CACHE_MAX_ENTRIES = 256
+_terminal_batch_cache: "OrderedDict[str, tuple]" = OrderedDict()
+
+
 def fetch_batch_by_id(batch_id: str) -> Optional[Dict[str, Any]]:
+    cached = _terminal_batch_cache.get(batch_id)
+    if cached is not None:
+        expires_at, row = cached
+        if expires_at > time.monotonic():
+            _terminal_batch_cache.move_to_end(batch_id)
+            return copy.deepcopy(row)
+        _terminal_batch_cache.pop(batch_id, None)
     try:
         supabase = get_db_client()
         resp = supabase.table("feedback_proposals").select("*").eq("id", batch_id).execute()
         rows = resp.data or []
-        return rows[0] if rows else None
+        row = rows[0] if rows else None
+        if row and row.get("status") in _TERMINAL_BATCH_STATUSES:
+            _terminal_batch_cache[batch_id] = (
+                time.monotonic() + _BATCH_CACHE_TTL_SECONDS,
+                copy.deepcopy(row),
+            )
+            _terminal_batch_cache.move_to_end(batch_id)
+            while len(_terminal_batch_cache) > _BATCH_CACHE_MAX_ENTRIES:
+                _terminal_batch_cache.popitem(last=False)
+        return row
     except Exception as e:
         handle_error("배치조회", e)
         return None
@@ -513,7 +731,7 @@ async def mark_target_decision(
     """
     try:
         supabase = get_db_client()
-        resp = supabase.rpc(
+        query = supabase.rpc(
             "decide_feedback_proposal_target",
             {
                 "p_batch_id": batch_id,
@@ -524,7 +742,8 @@ async def mark_target_decision(
                 "p_decided_by_email": decided_by_email,
                 "p_decision_note": decision_note,
             },
-        ).execute()
+        )
+        resp = await asyncio.to_thread(query.execute)
         data = resp.data
         if isinstance(data, list):
             data = data[0] if data else None
@@ -654,7 +873,6 @@ def _get_dmn_definition_from_xml(tenant_id: str, proc_def_id: str) -> Optional[D
         if not rows:
             return None
         xml_text = rows[0].get("bpmn")
-        from core.dmn_xml import xml_to_dmn_decisions_rules
         return xml_to_dmn_decisions_rules(xml_text or "")
     except Exception as e:
         handle_error("DMN XML조회", e)
@@ -689,6 +907,39 @@ def list_agent_dmn_rules(tenant_id: str, agent_id: str) -> List[Dict[str, Any]]:
         return []
 
 
+def list_dmn_rules_by_agents(tenant_id: str, agent_ids: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+    """여러 에이전트가 소유한 DMN 규칙 목록을 한 번의 조회로 가져와 agent_id별로 묶는다.
+
+    에이전트마다 list_agent_dmn_rules를 부르면 에이전트 수만큼 proc_def를 조회하므로,
+    팬아웃처럼 여러 에이전트의 후보가 한꺼번에 필요할 때 쓴다. 각 후보는
+    list_agent_dmn_rules와 같은 {"id","name"} 형태다.
+    """
+    tid = (tenant_id or "").strip()
+    aids = list(dict.fromkeys((a or "").strip() for a in agent_ids if (a or "").strip()))
+    if not (tid and aids):
+        return {}
+    try:
+        supabase = get_db_client()
+        resp = (
+            supabase.table("proc_def")
+            .select("id,name,agent_id")
+            .eq("tenant_id", tid)
+            .in_("agent_id", aids)
+            .eq("type", "dmn")
+            .eq("isdeleted", False)
+            .execute()
+        )
+        by_agent: Dict[str, List[Dict[str, Any]]] = {aid: [] for aid in aids}
+        for row in resp.data or []:
+            owner = row.get("agent_id")
+            if owner in by_agent:
+                by_agent[owner].append({"id": row.get("id"), "name": row.get("name")})
+        return by_agent
+    except Exception as e:
+        handle_error("에이전트DMN목록일괄조회", e)
+        return {}
+
+
 def load_activity_skills(tenant_id: str, proc_def_id: str, activity_id: str) -> List[str]:
     """프로세스 정의에서 특정 액티비티에 설정된 스킬 이름 목록을 반환. 실패 시 빈 리스트."""
     aid = (activity_id or "").strip()
@@ -845,10 +1096,13 @@ def compute_next_draft_version(tenant_id: str, proc_def_id: str) -> str:
     return f"{base_version}-{_generate_version_suffix()}"
 
 
+# slug에서 구분자로 치환할 문자(영숫자/한글 외) — DMN/요소 id 생성마다 재컴파일하지 않는다.
+_SLUG_SEPARATOR_RE = re.compile(r"[^0-9A-Za-z가-힣]+")
+
+
 def _slugify_for_dmn_id(text: str) -> str:
     """decision_id/rule_id 생성용 slug. 06-dmn.md 컨벤션(dmn_decision_<snake_case>)을 따른다."""
-    import re
-    slug = re.sub(r"[^0-9A-Za-z가-힣]+", "_", (text or "").strip()).strip("_")
+    slug = _SLUG_SEPARATOR_RE.sub("_", (text or "").strip()).strip("_")
     return slug.lower() if slug else "unnamed"
 
 
@@ -861,8 +1115,6 @@ def merge_dmn_artifact_into_definition(definition: Dict[str, Any], artifact: Dic
     dmn_rule_<slug>_<순번>)에 맞는 id를 여기서 새로 만든다. 이미 같은 id의
     decision/rule이 있으면 중복 추가하지 않는다.
     """
-    import copy
-
     merged = copy.deepcopy(definition) if isinstance(definition, dict) else {}
 
     decisions = merged.get("dmn_decisions")
@@ -1070,17 +1322,18 @@ def merge_process_definition_artifact_into_definition(
 
     반환값은 (병합된 definition 사본, MODIFY에서 ADD로 강등된 항목 수)다.
     """
-    import copy
-
     merged = copy.deepcopy(definition) if isinstance(definition, dict) else {}
     demoted_count = 0
 
     for array_key, kind in _PROCESS_DEFINITION_ARRAY_KINDS.items():
         existing = merged.get(array_key)
         existing = list(existing) if isinstance(existing, list) else []
-        existing_ids = {
-            el.get("id") for el in existing if isinstance(el, dict) and el.get("id")
-        }
+        # id → existing 내 위치. MODIFY가 대상 요소를 매번 선형 탐색하지 않도록 한 번만
+        # 만든다(같은 id가 중복돼 있으면 기존 동작대로 첫 번째 요소를 갱신한다).
+        existing_index: Dict[str, int] = {}
+        for idx, el in enumerate(existing):
+            if isinstance(el, dict) and el.get("id"):
+                existing_index.setdefault(el["id"], idx)
 
         for raw_entry in artifact.get(array_key) or []:
             if not isinstance(raw_entry, dict):
@@ -1089,38 +1342,36 @@ def merge_process_definition_artifact_into_definition(
             entry_id = (raw_entry.get("id") or "").strip()
             element, basis = _process_definition_element_and_basis(kind, raw_entry)
 
-            if change_type == "MODIFY" and entry_id and entry_id in existing_ids:
-                for idx, el in enumerate(existing):
-                    if isinstance(el, dict) and el.get("id") == entry_id:
-                        existing[idx] = {**el, **element, "id": entry_id}
-                        break
+            if change_type == "MODIFY" and entry_id and entry_id in existing_index:
+                idx = existing_index[entry_id]
+                existing[idx] = {**existing[idx], **element, "id": entry_id}
                 continue
 
             if change_type == "MODIFY":
                 # 매칭되는 live 요소가 없음 → ADD로 강등. 지어낸 id는 재사용하지 않는다.
                 demoted_count += 1
                 new_id = _slugify_for_element_id(kind, basis)
-                if new_id in existing_ids:
+                if new_id in existing_index:
                     continue  # 이전에 이미 강등/추가된 것과 같은 요소 → dedup
                 element["id"] = new_id
+                existing_index[new_id] = len(existing)
                 existing.append(element)
-                existing_ids.add(new_id)
                 continue
 
             # ADD
             if entry_id:
-                if entry_id in existing_ids:
+                if entry_id in existing_index:
                     continue  # 이미 있는 id → dedup, 건너뜀
                 element["id"] = entry_id
+                existing_index[entry_id] = len(existing)
                 existing.append(element)
-                existing_ids.add(entry_id)
             else:
                 new_id = _slugify_for_element_id(kind, basis)
-                if new_id in existing_ids:
+                if new_id in existing_index:
                     continue
                 element["id"] = new_id
+                existing_index[new_id] = len(existing)
                 existing.append(element)
-                existing_ids.add(new_id)
 
         merged[array_key] = existing
 
@@ -3,7 +3,9 @@ Deep Agent 기반 피드백 처리
 deepagents 라이브러리를 사용하여 피드백 → 스킬 개선 수행
 """
 
+import json
 import os
+import re
 from typing import Dict, List, Optional, Any
 
 from deepagents import create_deep_agent
@@ -22,6 +24,16 @@ SKILLS_DIR = os.getenv(
     os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "skills"),
 )
 
+# 실행 결과 검증용 — 실제 변경을 저장하는 도구와, 최종 출력이 "변경했다"/"하지 않았다"고
+# 주장하는지 판단하는 키워드. 호출마다 다시 만들지 않도록 모듈 상수로 둔다.
+# 키워드 묶음은 하나의 대소문자 무시 정규식으로 컴파일해, 출력 전체를 소문자로 복사하고
+# 키워드마다 다시 훑는 대신 출력을 한 번만 스캔한다.
+_COMMIT_TOOLS = frozenset({"commit_to_skill", "attach_skills_to_agent"})
+_MUTATION_KEYWORDS = ("create", "update", "delete", "저장", "생성", "수정", "삭제", "커밋")
+_IGNORE_KEYWORDS = ("ignore", "무시", "저장하지", "처리하지", "변경 불필요", "재시도")
+_MUTATION_RE = re.compile("|".join(map(re.escape, _MUTATION_KEYWORDS)), re.IGNORECASE)
+_IGNORE_RE = re.compile("|".join(map(re.escape, _IGNORE_KEYWORDS)), re.IGNORECASE)
+
 
 SYSTEM_PROMPT = """당신은 에이전트 피드백을 분석하여 스킬(SKILL)을 개선하는 전문가입니다.
 
@@ -145,22 +157,21 @@ def _format_feedback_input(
 
     events_summary = "없음"
     if events:
-        import json
         lines = []
+        append = lines.append
         for ev in events[:50]:
-            ev_type = ev.get("event_type", "")
-            status = ev.get("status", "")
-            crew_type = ev.get("crew_type", "")
-            ts = ev.get("timestamp", "")
-            data_str = ""
+            get = ev.get
+            data = get("data", {})
             try:
-                data = ev.get("data", {})
                 data_str = json.dumps(data, ensure_ascii=False)
                 if len(data_str) > 300:
                     data_str = data_str[:300] + "...(truncated)"
             except Exception:
-                data_str = str(ev.get("data", ""))[:300]
-            lines.append(f"- time={ts}, type={ev_type}, status={status}, crew_type={crew_type}, data={data_str}")
+                data_str = str(get("data", ""))[:300]
+            append(
+                f"- time={get('timestamp', '')}, type={get('event_type', '')}, status={get('status', '')}, "
+                f"crew_type={get('crew_type', '')}, data={data_str}"
+            )
         events_summary = "\n".join(lines)
 
     bound_skill_section = ""
@@ -294,19 +305,11 @@ async def process_feedback_with_deep_agent(
                     output = content
 
         # commit 도구 호출 여부 확인
-        committed_tools = {"commit_to_skill", "attach_skills_to_agent"}
-        did_commit = any(t in committed_tools for t in used_tools)
+        did_commit = any(t in _COMMIT_TOOLS for t in used_tools)
 
         # 말로만 결론을 내고 commit하지 않은 경우 체크
-        output_lower = (output or "").lower()
-        claims_mutation = any(
-            kw in output_lower
-            for kw in ["create", "update", "delete", "저장", "생성", "수정", "삭제", "커밋"]
-        )
-        claims_ignore = any(
-            kw in output_lower
-            for kw in ["ignore", "무시", "저장하지", "처리하지", "변경 불필요", "재시도"]
-        )
+        claims_mutation = _MUTATION_RE.search(output or "") is not None
+        claims_ignore = _IGNORE_RE.search(output or "") is not None
 
         if not did_commit and claims_mutation and not claims_ignore:
             err = "Deep Agent가 저장/수정/삭제 결론을 냈지만 도구를 호출하지 않아 실제 변경이 저장되지 않았습니다. (no_commit)"
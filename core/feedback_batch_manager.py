@@ -23,23 +23,27 @@ add-process-definition-apply design.md 참고).
 
 import asyncio
 import json
+import os
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from utils.logger import log, handle_error
 from core.database import (
     append_feedback_to_batch,
     extract_new_feedback_items,
-    fetch_collecting_batches,
+    iter_collecting_batch_pages,
+    fetch_events_by_todo_ids,
     fetch_feedback_task,
     fetch_proc_def_name,
     fetch_todolist_rows_by_ids,
     list_agent_dmn_rules,
+    list_dmn_rules_by_agents,
     load_activity_skills,
     mark_batch_discarded,
     mark_batch_proposed,
     mark_feedback_collected_count,
     update_feedback_status,
+    update_feedback_status_bulk,
     _get_agent_by_id,
     _get_dmn_definition_from_xml,
     _get_proc_def_definition,
@@ -69,6 +73,14 @@ BATCH_TRIGGER_MAX_AGE = timedelta(days=3)
 # 배치 전체 이벤트 로그 상한 (여러 워크아이템의 이벤트를 합치므로 최신순으로 상한을 둔다)
 _MAX_EVENTS_PER_BATCH = 100
 
+# 한 트리거 틱에서 동시에 처리할 배치 수 상한 — 배치마다 LLM 호출(분류/식별 판단)이
+# 들어가므로 LLM 프록시의 RPM/TPM 한도 안에서 환경변수로 조정한다.
+_BATCH_TRIGGER_CONCURRENCY = max(1, int(os.getenv("BATCH_TRIGGER_CONCURRENCY", "4")))
+
+# 승인된 DMN_RULE을 다른 에이전트에 팬아웃할 때, 에이전트별 기존 DMN 식별(LLM 판단)을
+# 동시에 몇 개까지 돌릴지 — draft/PR 생성은 버전 번호 충돌을 피하려고 순차로 유지한다.
+_DMN_FANOUT_CONCURRENCY = max(1, int(os.getenv("DMN_FANOUT_CONCURRENCY", "4")))
+
 
 # ---------------------------------------------------------------------------
 # 1. 수집 루프 — 피드백을 즉시 처리하지 않고 배치에 적재만 한다
@@ -165,10 +177,15 @@ async def start_feedback_batch_collection(interval: int = 7) -> None:
 # 2. 배치 트리거 루프 — 건수/경과 시간 조건 확인 후 규칙 추출
 # ---------------------------------------------------------------------------
 
-def is_batch_triggered(collected_items: List[Dict[str, Any]], first_collected_at: str) -> bool:
+def is_batch_triggered(
+    collected_items: List[Dict[str, Any]],
+    first_collected_at: str,
+    now: Optional[datetime] = None,
+) -> bool:
     """건수(5건) 또는 경과 시간(3일) 중 먼저 오는 조건을 충족했는지 확인한다.
 
-    DB/LLM 호출 없이 순수하게 판단하므로 단위 테스트가 쉽다.
+    DB/LLM 호출 없이 순수하게 판단하므로 단위 테스트가 쉽다. now(UTC)를 넘기면 그 시각
+    기준으로 판단한다 — 트리거 루프는 페이지마다 한 번만 구해 모든 배치에 같이 쓴다.
     """
     if len(collected_items) >= BATCH_TRIGGER_COUNT:
         return True
@@ -182,31 +199,27 @@ def is_batch_triggered(collected_items: List[Dict[str, Any]], first_collected_at
     if first_dt.tzinfo is None:
         first_dt = first_dt.replace(tzinfo=timezone.utc)
 
-    return datetime.now(timezone.utc) - first_dt >= BATCH_TRIGGER_MAX_AGE
+    return (now or datetime.now(timezone.utc)) - first_dt >= BATCH_TRIGGER_MAX_AGE
 
 
-def _union_user_ids(rows: List[Dict[str, Any]]) -> str:
+def _union_agent_refs(rows: List[Dict[str, Any]]) -> Tuple[str, List[Any]]:
+    """워크아이템 행들의 담당자 참조를 한 번의 순회로 모은다 — get_agents_info에 그대로
+    넘길 (user_id 합집합을 정렬해 콤마로 이은 문자열, assignees를 이어붙인 리스트)."""
     ids = set()
+    merged: List[Any] = []
     for row in rows:
         for uid in str(row.get("user_id") or "").split(","):
             uid = uid.strip()
             if uid:
                 ids.add(uid)
-    return ",".join(sorted(ids))
-
-
-def _union_assignees(rows: List[Dict[str, Any]]) -> List[Any]:
-    import json as _json
-    merged: List[Any] = []
-    for row in rows:
         raw = row.get("assignees")
         try:
-            data = _json.loads(raw) if isinstance(raw, str) else raw
+            data = json.loads(raw) if isinstance(raw, str) else raw
         except (ValueError, TypeError):
             continue
         if isinstance(data, list):
             merged.extend(data)
-    return merged
+    return ",".join(sorted(ids)), merged
 
 
 def _parse_comma_skills(text: Optional[str]) -> List[str]:
@@ -222,7 +235,7 @@ async def _representative_agent(rows: List[Dict[str, Any]]) -> Optional[Dict[str
     """
     sorted_rows = sorted(rows, key=lambda r: r.get("end_date") or r.get("updated_at") or "", reverse=True)
     for row in sorted_rows:
-        agents = await get_agents_info(_union_user_ids([row]), _union_assignees([row]))
+        agents = await get_agents_info(*_union_agent_refs([row]))
         if agents:
             return agents[0]
     return None
@@ -233,15 +246,43 @@ def _feedback_author_ids(collected_items: List[Dict[str, Any]]) -> List[str]:
     resource_pull_requests.requester_id(uuid[])에 그대로 들어간다 — 이 배치의
     개선을 촉발한 사람들이 requester다(승인자는 reviewer_id로 별도 기록)."""
     items_sorted = sorted(collected_items, key=lambda x: x.get("time", ""))
-    seen: Dict[str, None] = {}
-    for item in items_sorted:
-        uid = str(item.get("user_id") or "").strip()
-        if uid and uid not in seen:
-            seen[uid] = None
-    return list(seen.keys())
+    # dict.fromkeys는 첫 등장 순서를 유지하며 키당 한 번만 삽입한다.
+    seen = dict.fromkeys(str(item.get("user_id") or "").strip() for item in items_sorted)
+    seen.pop("", None)
+    return list(seen)
+
+
+async def _batch_representative_agent(
+    batch: Dict[str, Any], cache: Optional[Dict[str, Any]] = None
+) -> Optional[Dict[str, Any]]:
+    """배치의 대표 에이전트를 구한다. cache(배치 하나를 처리하는 동안 공유하는 dict)가
+    주어지면 첫 조회를 담아두고 재사용한다 — 한 배치의 여러 target이 같은
+    워크아이템 행/담당 에이전트를 target마다 다시 조회하지 않도록 하기 위함이다.
+
+    target들은 동시에 식별되므로 결과가 아니라 조회 Task 자체를 담아, 먼저 시작된
+    조회를 나머지 target이 함께 기다리게 한다."""
 
+    async def _load() -> Optional[Dict[str, Any]]:
+        items = batch.get("collected_items") or []
+        todo_ids = [item.get("todo_id") for item in items if item.get("todo_id")]
+        rows = await fetch_todolist_rows_by_ids(todo_ids)
+        return await _representative_agent(rows)
 
-async def _fill_target_identity(batch: Dict[str, Any], target: Dict[str, Any]) -> bool:
+    if cache is None:
+        return await _load()
+
+    task = cache.get("agent")
+    if task is None:
+        task = asyncio.ensure_future(_load())
+        cache["agent"] = task
+    return await task
+
+
+async def _fill_target_identity(
+    batch: Dict[str, Any],
+    target: Dict[str, Any],
+    cache: Optional[Dict[str, Any]] = None,
+) -> bool:
     """target(SKILL/DMN_RULE/PROCESS_DEFINITION)이 가리킬 수 있는 기존 리소스가 실제로
     있는지 확인하고, 있으면 target["id"]/["name"]을 채운다.
 
@@ -252,6 +293,9 @@ async def _fill_target_identity(batch: Dict[str, Any], target: Dict[str, Any]) -
     PROCESS_DEFINITION은 배치의 proc_def_id 자체이므로 바로 확정된다. SKILL/DMN_RULE은
     배치의 대표 에이전트(없으면 활동 귀속) 기준으로 한 번만 계산하는 미리보기 값이다 —
     실제 승인 처리는 에이전트별로 다시 판단한다(apply_approved_proposal/apply_approved_dmn_target).
+
+    cache는 같은 배치의 target들이 대표 에이전트 조회 결과를 공유하기 위한 dict다
+    (_process_triggered_batch가 배치마다 하나 만들어 넘긴다).
     """
     ttype = target.get("type")
     tenant_id = batch.get("tenant_id", "")
@@ -265,10 +309,7 @@ async def _fill_target_identity(batch: Dict[str, Any], target: Dict[str, Any]) -
         target["name"] = name
         return True
 
-    items = batch.get("collected_items") or []
-    todo_ids = [item.get("todo_id") for item in items if item.get("todo_id")]
-    rows = await fetch_todolist_rows_by_ids(todo_ids)
-    agent = await _representative_agent(rows)
+    agent = await _batch_representative_agent(batch, cache)
 
     if ttype == "SKILL":
         if agent:
@@ -317,20 +358,35 @@ async def _process_triggered_batch(batch: Dict[str, Any]) -> None:
 
     async def _discard(reason: str) -> None:
         if await mark_batch_discarded(batch_id):
-            for item in items:
-                todo_id = item.get("todo_id")
-                if todo_id:
-                    await update_feedback_status(todo_id, "REJECTED")
+            await update_feedback_status_bulk(
+                [item.get("todo_id") for item in items], "REJECTED"
+            )
             log(f"배치 폐기({reason}): batch_id={batch_id}")
 
     if not targets:
         await _discard("공통 관심사 없음")
         return
 
-    kept_targets = []
+    # LLM이 같은 target을 중복으로 내놓으면 식별 판단(LLM)과 제안 항목이 두 번씩 생기므로
+    # (type, artifact)가 완전히 같은 target은 첫 항목만 남긴다.
+    unique_targets = []
+    seen_keys = set()
     for target in targets:
-        if await _fill_target_identity(batch, target):
-            kept_targets.append(target)
+        key = (target.get("type"), json.dumps(target.get("artifact"), sort_keys=True, ensure_ascii=False))
+        if key in seen_keys:
+            continue
+        seen_keys.add(key)
+        unique_targets.append(target)
+    if len(unique_targets) < len(targets):
+        log(f"⚠️ 중복 target {len(targets) - len(unique_targets)}개 제거: batch_id={batch_id}")
+
+    # target별 식별(후보 조회 + LLM 판단)은 서로 독립적이므로 동시에 진행한다. 배치 수준
+    # 동시성은 _BATCH_TRIGGER_CONCURRENCY가, 배치 안의 target 수는 target 종류 수가 상한이다.
+    identity_cache: Dict[str, Any] = {}
+    keep_flags = await asyncio.gather(
+        *(_fill_target_identity(batch, target, identity_cache) for target in unique_targets)
+    )
+    kept_targets = [target for target, keep in zip(unique_targets, keep_flags) if keep]
 
     if not kept_targets:
         await _discard("개선할 기존 리소스 없음")
@@ -343,16 +399,43 @@ async def _process_triggered_batch(batch: Dict[str, Any]) -> None:
         log(f"배치 제안 생성: batch_id={batch_id}, targets={target_types}")
 
 
+async def _process_triggered_batches(batches: List[Dict[str, Any]]) -> None:
+    """트리거된 배치들을 동시에(최대 _BATCH_TRIGGER_CONCURRENCY개) 처리한다.
+
+    배치는 서로 다른 (tenant_id, proc_def_id, activity_id) 키라 독립적이다. 한 배치의
+    실패가 같은 틱의 나머지 배치 처리를 막지 않도록 배치 단위로 에러를 격리한다.
+    """
+    if not batches:
+        return
+    semaphore = asyncio.Semaphore(_BATCH_TRIGGER_CONCURRENCY)
+
+    async def _run(batch: Dict[str, Any]) -> None:
+        async with semaphore:
+            try:
+                await _process_triggered_batch(batch)
+            except Exception as e:
+                log(f"⚠️ 배치 처리 에러 (다음 배치 계속): batch_id={batch.get('id')}")
+                handle_error("배치트리거처리", e)
+
+    await asyncio.gather(*(_run(batch) for batch in batches))
+
+
 async def start_feedback_batch_trigger(interval: int = 900) -> None:
     """COLLECTING 배치의 트리거 조건을 주기적으로 확인한다. 서버 수명 동안 무한 루프로 실행된다."""
     log(f"피드백 배치 트리거 확인 시작 (interval={interval}s)")
 
     while True:
         try:
-            batches = await fetch_collecting_batches()
-            for batch in batches:
-                if is_batch_triggered(batch.get("collected_items") or [], batch.get("first_collected_at", "")):
-                    await _process_triggered_batch(batch)
+            # COLLECTING 배치 전체를 한꺼번에 메모리에 올리지 않고 페이지 단위로 확인·처리한다.
+            async for batches in iter_collecting_batch_pages():
+                now = datetime.now(timezone.utc)
+                triggered = [
+                    batch for batch in batches
+                    if is_batch_triggered(
+                        batch.get("collected_items") or [], batch.get("first_collected_at", ""), now
+                    )
+                ]
+                await _process_triggered_batches(triggered)
         except asyncio.CancelledError:
             log("피드백 배치 트리거 확인 종료")
             break
@@ -406,34 +489,30 @@ async def apply_approved_proposal(
 
     if not extracted_rule:
         log(f"⚠️ 승인된 SKILL target에 artifact가 없음: batch_id={batch_id}")
-        for todo_id in todo_ids:
-            await update_feedback_status(todo_id, "FAILED")
+        await update_feedback_status_bulk(todo_ids, "FAILED")
         return
 
-    rows = await fetch_todolist_rows_by_ids(todo_ids)
-    user_ids = _union_user_ids(rows)
-    assignees = _union_assignees(rows)
+    # 워크아이템 행과 이벤트 로그는 서로 독립적이므로 함께 조회한다. 이벤트는 워크아이템마다
+    # 따로 조회하지 않고 배치 전체의 최신 _MAX_EVENTS_PER_BATCH건을 한 번에 가져온다.
+    rows, events = await asyncio.gather(
+        fetch_todolist_rows_by_ids(todo_ids),
+        fetch_events_by_todo_ids(todo_ids, limit=_MAX_EVENTS_PER_BATCH),
+    )
+    user_ids, assignees = _union_agent_refs(rows)
     description = _representative_description(rows)
 
-    from core.database import fetch_events_by_todo_id
-    events: List[Dict[str, Any]] = []
-    for todo_id in todo_ids:
-        events.extend(await fetch_events_by_todo_id(todo_id))
-    events.sort(key=lambda e: e.get("timestamp", ""))
-    if len(events) > _MAX_EVENTS_PER_BATCH:
-        events = events[-_MAX_EVENTS_PER_BATCH:]
-
     agents = await get_agents_info(user_ids, assignees)
 
     had_error = False
 
     if agents:
-        from core.feedback_processor import match_feedback_to_agents
         matching = await match_feedback_to_agents(extracted_rule, agents, description, events)
         agent_feedbacks = matching.get("agent_feedbacks", [])
 
         if not agent_feedbacks:
             log(f"매칭된 피드백 없음: batch_id={batch_id}")
+        # 매칭 결과의 agent_id는 방금 조회한 agents 중 하나이므로 다시 조회하지 않는다.
+        agents_by_id = {a.get("id"): a for a in agents}
         for fb_item in agent_feedbacks:
             aid = fb_item.get("agent_id")
             aname = fb_item.get("agent_name", "Unknown")
@@ -441,7 +520,7 @@ async def apply_approved_proposal(
             if not lc:
                 continue
 
-            agent_info = _get_agent_by_id(aid)
+            agent_info = agents_by_id.get(aid) or await asyncio.to_thread(_get_agent_by_id, aid)
             if not agent_info:
                 continue
 
@@ -491,8 +570,7 @@ async def apply_approved_proposal(
             handle_error("피드백처리(활동전용)", e)
 
     final_status = "FAILED" if had_error else "COMPLETED"
-    for todo_id in todo_ids:
-        await update_feedback_status(todo_id, final_status)
+    await update_feedback_status_bulk(todo_ids, final_status)
 
     log(f"승인된 배치 처리 완료: batch_id={batch_id}, status={final_status}")
 
@@ -622,7 +700,7 @@ async def apply_approved_dmn_target(
         applied_dmn_ids.add(approved_id)
 
     rows = await fetch_todolist_rows_by_ids(todo_ids)
-    agents = await get_agents_info(_union_user_ids(rows), _union_assignees(rows))
+    agents = await get_agents_info(*_union_agent_refs(rows))
 
     if not agents:
         if not results:
@@ -633,13 +711,27 @@ async def apply_approved_dmn_target(
     agent_feedbacks = matching.get("agent_feedbacks", [])
     if not agent_feedbacks and not results:
         log(f"매칭된 DMN 담당 에이전트 없음: batch_id={batch_id}")
-    for fb_item in agent_feedbacks:
-        aid = fb_item.get("agent_id")
+
+    # 에이전트별 식별(후보 조회 + LLM 판단)은 서로 독립적이라 동시에 돌리고, 결과는 매칭
+    # 순서대로 순차 적용한다 — 같은 dmn_id로 식별된 에이전트는 먼저 나온 쪽만 적용된다.
+    # 후보 DMN 목록은 에이전트마다 조회하지 않고 한 번에 가져온다.
+    semaphore = asyncio.Semaphore(_DMN_FANOUT_CONCURRENCY)
+    fanout = [fb_item for fb_item in agent_feedbacks if fb_item.get("agent_id")]
+    candidates_by_agent = list_dmn_rules_by_agents(tenant_id, [fb_item["agent_id"] for fb_item in fanout])
+
+    async def _resolve_for_agent(aid: str) -> Dict[str, Any]:
+        async with semaphore:
+            return await resolve_dmn_identity(artifact, candidates_by_agent.get(aid, []))
+
+    resolutions = await asyncio.gather(
+        *(_resolve_for_agent(fb_item["agent_id"]) for fb_item in fanout),
+        return_exceptions=True,
+    )
+    for fb_item, resolved in zip(fanout, resolutions):
         aname = fb_item.get("agent_name", "Unknown")
-        if not aid:
+        if isinstance(resolved, Exception):
+            handle_error(f"DMN식별({aname})", resolved)
             continue
-        candidates = list_agent_dmn_rules(tenant_id, aid)
-        resolved = await resolve_dmn_identity(artifact, candidates)
         if resolved.get("decision") != "UPDATE" or not resolved.get("id"):
             continue
         if resolved["id"] in applied_dmn_ids:
@@ -1,69 +1,69 @@
+import hashlib
 import json
+from collections import OrderedDict
 from typing import Dict, List, Any, Optional
 from utils.logger import log, handle_error
-from core.llm import create_llm
+from core.llm import create_llm, get_llm_model
 
 
 def clean_json_response(content: str) -> str:
-    content = content.replace("```json", "").replace("```", "")
+    """LLM 응답에서 JSON 객체 부분만 잘라낸다.
+
+    코드 펜스(```json ... ```)나 앞뒤 설명 문구를 문자열 전체 치환으로 지우는 대신,
+    첫 '{'부터 마지막 '}'까지 한 번에 슬라이스한다. 객체가 보이지 않으면 펜스만
+    걷어낸 원문을 돌려줘 호출부의 json.loads가 평소처럼 실패하게 한다(펜스가 없으면
+    치환 없이 strip만 한다).
+    """
+    start = content.find("{")
+    end = content.rfind("}")
+    if start != -1 and end > start:
+        return content[start:end + 1]
+    if "```" in content:
+        content = content.replace("```json", "").replace("```", "")
     return content.strip()
 
 
-async def match_feedback_to_agents(
-    feedback: str,
-    agents: List[Dict],
-    task_description: str = "",
-    events: Optional[List[Dict[str, Any]]] = None,
-) -> Dict:
-    """
-    AI를 사용해 피드백을 각 에이전트에 매칭하고 스킬 개선용 학습 후보를 생성합니다.
-    """
+# resolve_*_identity 판단 결과 캐시 (프로세스 내, 정확 일치만).
+# 같은 artifact/후보 목록으로 같은 판단을 반복하는 경우(같은 배치의 target 재판단,
+# 에이전트별 DMN 재판단 등)에 LLM 호출을 생략한다. 키는 모델명+입력의 canonical JSON
+# SHA256 — 후보 목록이 하나라도 바뀌면 키가 달라지므로 오래된 판단을 재사용하지 않는다.
+# 폴백(파싱 실패 등) 결과는 캐시하지 않는다.
+_IDENTITY_CACHE_MAX_ENTRIES = 512
+_identity_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
 
-    llm = create_llm(streaming=False, temperature=0)
 
-    agents_info = "\n".join([
-        f"- 에이전트 ID: {agent['id']}, 이름: {agent['name']}, 역할: {agent['role']}, 목표: {agent['goal']}"
-        for agent in agents
-    ])
+def _identity_cache_key(kind: str, payload: Dict[str, Any]) -> str:
+    canonical = json.dumps(
+        {"kind": kind, "model": get_llm_model(), "payload": payload},
+        ensure_ascii=False,
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
 
-    events_summary = "없음"
-    if events:
-        lines = []
-        for ev in events[:30]:
-            ev_type = ev.get("event_type", "")
-            status = ev.get("status", "")
-            crew_type = ev.get("crew_type", "")
-            ts = ev.get("timestamp", "")
-            data_str = ""
-            try:
-                data = ev.get("data", {})
-                data_str = json.dumps(data, ensure_ascii=False)
-                if len(data_str) > 300:
-                    data_str = data_str[:300] + "...(truncated)"
-            except Exception:
-                data_str = str(ev.get("data", ""))[:300]
-            lines.append(
-                f"- time={ts}, type={ev_type}, status={status}, crew_type={crew_type}, data={data_str}"
-            )
-        events_summary = "\n".join(lines)
 
-    prompt = f"""
-다음 상황을 분석하여 각 에이전트에게 적절한 스킬 개선 피드백을 생성해주세요.
+def _identity_cache_get(key: str) -> Optional[Dict[str, Any]]:
+    cached = _identity_cache.get(key)
+    if cached is None:
+        return None
+    _identity_cache.move_to_end(key)
+    return dict(cached)
 
-**작업 지시사항:**
-{task_description}
 
-**사용자 피드백 (시간순):**
-{feedback}
+def _identity_cache_set(key: str, result: Dict[str, Any]) -> None:
+    _identity_cache[key] = dict(result)
+    _identity_cache.move_to_end(key)
+    while len(_identity_cache) > _IDENTITY_CACHE_MAX_ENTRIES:
+        _identity_cache.popitem(last=False)
 
-**해당 작업의 이벤트 로그 (시간순, 실제 스킬/도구 사용 내역):**
-{events_summary}
 
-**에이전트 목록:**
-{agents_info}
+# match_feedback_to_agents 프롬프트 — classify_and_extract_proposal과 같은 방식으로 고정 지시는
+# system 메시지(모듈 상수)로 맨 앞에 두고, 호출마다 바뀌는 내용만 user 메시지 템플릿에 채운다.
+_MATCH_SYSTEM_PROMPT = """
+사용자 메시지의 상황을 분석하여 각 에이전트에게 적절한 스킬 개선 피드백을 생성해주세요.
 
 **상황 설명:**
-에이전트들이 위의 작업지시사항에 따라 작업을 수행했지만, 사용자가 피드백을 제공했습니다.
+에이전트들이 사용자 메시지의 작업지시사항에 따라 작업을 수행했지만, 사용자가 피드백을 제공했습니다.
 이 피드백을 바탕으로 에이전트의 스킬(작업 절차)을 개선하기 위한 학습 후보를 생성하세요.
 
 **피드백 처리 방식:**
@@ -82,22 +82,79 @@ async def match_feedback_to_agents(
 - 추가 설명 없이 오직 아래 JSON 구조로만 응답하세요
 - JSON 객체만 출력하세요
 
-{{
+{
   "agent_feedbacks": [
-    {{
+    {
       "agent_id": "에이전트_ID",
       "agent_name": "에이전트_이름",
-      "learning_candidate": {{
+      "learning_candidate": {
         "content": "시간순 피드백들을 통합한 자연스러운 스킬 개선 가이드",
         "intent_hint": "이 피드백이 어떤 스킬 개선을 요구하는지에 대한 요약 힌트"
-      }}
-    }}
+      }
+    }
   ]
-}}
+}
+"""
+
+_MATCH_USER_TEMPLATE = """**작업 지시사항:**
+{task_description}
+
+**사용자 피드백 (시간순):**
+{feedback}
+
+**해당 작업의 이벤트 로그 (시간순, 실제 스킬/도구 사용 내역):**
+{events_summary}
+
+**에이전트 목록:**
+{agents_info}
 """
 
+
+async def match_feedback_to_agents(
+    feedback: str,
+    agents: List[Dict],
+    task_description: str = "",
+    events: Optional[List[Dict[str, Any]]] = None,
+) -> Dict:
+    """
+    AI를 사용해 피드백을 각 에이전트에 매칭하고 스킬 개선용 학습 후보를 생성합니다.
+    """
+
+    llm = create_llm(streaming=False, temperature=0, json_mode=True)
+
+    agents_info = "\n".join(
+        f"- 에이전트 ID: {agent['id']}, 이름: {agent['name']}, 역할: {agent['role']}, 목표: {agent['goal']}"
+        for agent in agents
+    )
+
+    events_summary = "없음"
+    if events:
+        lines = []
+        append = lines.append
+        for ev in events[:30]:
+            get = ev.get
+            data = get("data", {})
+            try:
+                data_str = json.dumps(data, ensure_ascii=False)
+                if len(data_str) > 300:
+                    data_str = data_str[:300] + "...(truncated)"
+            except Exception:
+                data_str = str(get("data", ""))[:300]
+            append(
+                f"- time={get('timestamp', '')}, type={get('event_type', '')}, status={get('status', '')}, "
+                f"crew_type={get('crew_type', '')}, data={data_str}"
+            )
+        events_summary = "\n".join(lines)
+
+    user_message = _MATCH_USER_TEMPLATE.format(
+        task_description=task_description,
+        feedback=feedback,
+        events_summary=events_summary,
+        agents_info=agents_info,
+    )
+
     try:
-        response = await llm.ainvoke(prompt)
+        response = await llm.ainvoke([("system", _MATCH_SYSTEM_PROMPT), ("human", user_message)])
         cleaned_content = clean_json_response(response.content)
 
         log(f"📤 LLM 전체 응답: {cleaned_content}")
@@ -123,44 +180,14 @@ async def match_feedback_to_agents(
 _VALID_TARGET_TYPES = {"SKILL", "DMN_RULE", "PROCESS_DEFINITION"}
 
 
-async def classify_and_extract_proposal(
-    collected_items: List[Dict],
-    task_description: str = "",
-) -> List[Dict[str, Any]]:
-    """트리거된 배치의 피드백이 무엇을 개선할 수 있는지 먼저 분류하고, 분류된 target마다 제안
-    아티팩트를 만든다. 분류와 target별 생성은 한 번의 LLM 호출로 처리한다.
-
-    target 종류:
-    - SKILL: 절차/실행 규칙. artifact는 자연어 일반 규칙 텍스트 (기존 extract_general_rule과 동일한
-      산출물 — 어떤 스킬을 고칠지 결정하거나 SKILL.md를 작성하지 않는다).
-    - DMN_RULE: 조건-결과 형태의 비즈니스 판단 규칙. artifact는 decision/rules를 담은 dict.
-    - PROCESS_DEFINITION: 업무 흐름(활동/분기/순서) 자체에 대한 변경. artifact는 activities/
-      sequences/gateways 변경안을 담은 dict.
-
-    DMN_RULE/PROCESS_DEFINITION artifact는 proc_def.definition과 같은 JSON 형태를 따르되,
-    이 함수는 실제 proc_def를 조회하거나 쓰지 않는다 — 제안 생성까지만 담당한다.
-
-    한 배치가 서로 다른 관심사를 동시에 담고 있으면 여러 target을 함께 반환할 수 있다(MIXED).
-    피드백들 사이에 공통 관심사가 전혀 없으면 빈 리스트를 반환한다(억지로 만들어내지 않는다).
-    """
-    llm = create_llm(streaming=False, temperature=0)
-
-    items_sorted = sorted(collected_items, key=lambda x: x.get("time", ""))
-    items_summary = "\n".join(
-        f"- time={item.get('time', '')}, content={item.get('content', '')}"
-        for item in items_sorted
-    ) or "없음"
-
-    prompt = f"""
-같은 업무 활동 단계에서 수집된 여러 워크아이템의 사용자 피드백입니다.
+# classify_and_extract_proposal 프롬프트의 고정 부분 — 매 호출마다 수 KB짜리 f-string을
+# 다시 만들지 않도록 모듈 로드 시 한 번만 만든다. 분류 기준/응답 형식 같은 고정 지시는
+# system 메시지로 맨 앞에 두고(호출 간 같은 prefix라 프롬프트 캐시 대상), 작업 지시사항과
+# 피드백 같은 가변 내용만 user 메시지에 끼워 join한다.
+_CLASSIFY_SYSTEM_PROMPT = """
+사용자 메시지로 같은 업무 활동 단계에서 수집된 여러 워크아이템의 사용자 피드백이 주어집니다.
 이 피드백들이 무엇을 개선하기 위한 것인지 먼저 분류한 뒤, 분류된 대상마다 그에 맞는 제안 내용을 만드세요.
 
-**작업 지시사항 (참고용):**
-{task_description}
-
-**수집된 피드백 (시간순):**
-{items_summary}
-
 **분류 기준 (하나의 배치가 여러 target에 동시에 해당할 수 있습니다):**
 
 1. **SKILL (절차/실행 규칙)**
@@ -188,45 +215,90 @@ async def classify_and_extract_proposal(
 - 추가 설명 없이 오직 아래 JSON 구조로만 응답하세요
 - JSON 객체만 출력하세요
 
-{{
+{
   "targets": [
-    {{
+    {
       "type": "SKILL",
       "artifact": "공통 절차 규칙을 자연스럽게 서술한 텍스트"
-    }},
-    {{
+    },
+    {
       "type": "DMN_RULE",
-      "artifact": {{
-        "decision": {{"name": "의사결정 이름", "description": "이 의사결정이 판단하는 것"}},
+      "artifact": {
+        "decision": {"name": "의사결정 이름", "description": "이 의사결정이 판단하는 것"},
         "rules": [
-          {{"when": "조건 (자연어)", "then": "결과/행동 (자연어)", "condition": "조건 (표현식 형태, 알 수 있는 경우)", "target": "결과가 가리키는 대상 (선택)"}}
+          {"when": "조건 (자연어)", "then": "결과/행동 (자연어)", "condition": "조건 (표현식 형태, 알 수 있는 경우)", "target": "결과가 가리키는 대상 (선택)"}
         ]
-      }}
-    }},
-    {{
+      }
+    },
+    {
       "type": "PROCESS_DEFINITION",
-      "artifact": {{
+      "artifact": {
         "summary": "흐름 변경 요약",
         "activities": [
-          {{"change_type": "ADD 또는 MODIFY", "id": "활동 id (신규면 임의 지정)", "name": "활동명", "role": "담당 역할", "note": "변경 내용 설명"}}
+          {"change_type": "ADD 또는 MODIFY", "id": "활동 id (신규면 임의 지정)", "name": "활동명", "role": "담당 역할", "note": "변경 내용 설명"}
         ],
         "sequences": [
-          {{"change_type": "ADD 또는 MODIFY", "from": "출발 활동/게이트웨이", "to": "도착 활동/게이트웨이", "condition": "분기 조건 (선택)", "note": "변경 내용 설명"}}
+          {"change_type": "ADD 또는 MODIFY", "from": "출발 활동/게이트웨이", "to": "도착 활동/게이트웨이", "condition": "분기 조건 (선택)", "note": "변경 내용 설명"}
         ],
         "gateways": [
-          {{"change_type": "ADD 또는 MODIFY", "id": "게이트웨이 id (신규면 임의 지정)", "type": "exclusiveGateway 등", "note": "변경 내용 설명"}}
+          {"change_type": "ADD 또는 MODIFY", "id": "게이트웨이 id (신규면 임의 지정)", "type": "exclusiveGateway 등", "note": "변경 내용 설명"}
         ]
-      }}
-    }}
+      }
+    }
   ]
-}}
+}
 
 - targets 배열에는 실제로 해당하는 타입만 포함하세요 (해당 없는 타입은 배열에서 완전히 제외).
 - 공통 관심사가 전혀 없으면 "targets": [] 로 응답하세요.
 """
 
+_CLASSIFY_USER_TEMPLATE = """**작업 지시사항 (참고용):**
+{task_description}
+
+**수집된 피드백 (시간순):**
+{items_summary}"""
+
+
+async def classify_and_extract_proposal(
+    collected_items: List[Dict],
+    task_description: str = "",
+) -> List[Dict[str, Any]]:
+    """트리거된 배치의 피드백이 무엇을 개선할 수 있는지 먼저 분류하고, 분류된 target마다 제안
+    아티팩트를 만든다. 분류와 target별 생성은 한 번의 LLM 호출로 처리한다.
+
+    target 종류:
+    - SKILL: 절차/실행 규칙. artifact는 자연어 일반 규칙 텍스트 (기존 extract_general_rule과 동일한
+      산출물 — 어떤 스킬을 고칠지 결정하거나 SKILL.md를 작성하지 않는다).
+    - DMN_RULE: 조건-결과 형태의 비즈니스 판단 규칙. artifact는 decision/rules를 담은 dict.
+    - PROCESS_DEFINITION: 업무 흐름(활동/분기/순서) 자체에 대한 변경. artifact는 activities/
+      sequences/gateways 변경안을 담은 dict.
+
+    DMN_RULE/PROCESS_DEFINITION artifact는 proc_def.definition과 같은 JSON 형태를 따르되,
+    이 함수는 실제 proc_def를 조회하거나 쓰지 않는다 — 제안 생성까지만 담당한다.
+
+    한 배치가 서로 다른 관심사를 동시에 담고 있으면 여러 target을 함께 반환할 수 있다(MIXED).
+    피드백들 사이에 공통 관심사가 전혀 없으면 빈 리스트를 반환한다(억지로 만들어내지 않는다).
+    내용이 있는 피드백이 하나도 없으면 분류할 것이 없으므로 LLM을 호출하지 않고 바로
+    빈 리스트를 반환한다.
+    """
+    if not any(str(item.get("content") or "").strip() for item in collected_items):
+        return []
+
+    llm = create_llm(streaming=False, temperature=0, json_mode=True)
+
+    items_sorted = sorted(collected_items, key=lambda x: x.get("time", ""))
+    items_summary = "\n".join(
+        f"- time={item.get('time', '')}, content={item.get('content', '')}"
+        for item in items_sorted
+    ) or "없음"
+
+    user_message = _CLASSIFY_USER_TEMPLATE.format(
+        task_description=task_description or "",
+        items_summary=items_summary,
+    )
+
     try:
-        response = await llm.ainvoke(prompt)
+        response = await llm.ainvoke([("system", _CLASSIFY_SYSTEM_PROMPT), ("human", user_message)])
         cleaned_content = clean_json_response(response.content)
         parsed_result = json.loads(cleaned_content)
         raw_targets = parsed_result.get("targets") or []
@@ -258,8 +330,19 @@ async def resolve_skill_identity(artifact_text: str, candidates: List[Dict[str,
     candidates는 유사도 점수로 미리 걸러내지 않고 이름+설명 전체를 그대로 LLM에 보여준다
     (progressive disclosure) — 임베딩 유사도 검색 대신 LLM이 직접 읽고 판단하게 한다.
     실패 시 PASS로 폴백한다(항상 결과를 반환).
+
+    비교할 기존 스킬이 하나도 없으면 UPDATE가 나올 수 없으므로 LLM을 호출하지 않고
+    바로 PASS를 반환한다.
     """
-    llm = create_llm(streaming=False, temperature=0)
+    if not candidates:
+        return {"decision": "PASS", "name": ""}
+
+    cache_key = _identity_cache_key("skill", {"artifact": artifact_text, "candidates": candidates})
+    cached = _identity_cache_get(cache_key)
+    if cached is not None:
+        return cached
+
+    llm = create_llm(streaming=False, temperature=0, json_mode=True)
 
     candidates_text = "\n".join(
         f"- 이름: {c.get('name', '')}, 설명: {c.get('description', '')}" for c in candidates
@@ -290,7 +373,9 @@ async def resolve_skill_identity(artifact_text: str, candidates: List[Dict[str,
         name = (parsed.get("name") or "").strip()
         if decision == "UPDATE" and not name:
             decision = "PASS"
-        return {"decision": decision if decision in ("PASS", "UPDATE") else "PASS", "name": name}
+        result = {"decision": decision if decision in ("PASS", "UPDATE") else "PASS", "name": name}
+        _identity_cache_set(cache_key, result)
+        return result
     except Exception as e:
         handle_error("스킬식별판단", e)
         return {"decision": "PASS", "name": ""}
@@ -305,8 +390,20 @@ async def resolve_dmn_identity(artifact: Dict[str, Any], candidates: List[Dict[s
     candidates는 특정 에이전트가 소유한 기존 DMN 목록({"id","name","description"}) —
     이름+설명 전체를 LLM에 보여주고 판단하게 한다(progressive disclosure, 유사도 검색 아님).
     실패 시 PASS로 폴백한다(항상 결과를 반환).
+
+    이 에이전트에게 기존 DMN이 하나도 없으면 UPDATE가 나올 수 없으므로 LLM을 호출하지
+    않고 바로 PASS를 반환한다.
     """
-    llm = create_llm(streaming=False, temperature=0)
+    if not candidates:
+        decision_info = artifact.get("decision") or {}
+        return {"decision": "PASS", "id": None, "name": (decision_info.get("name") or "").strip()}
+
+    cache_key = _identity_cache_key("dmn", {"artifact": artifact, "candidates": candidates})
+    cached = _identity_cache_get(cache_key)
+    if cached is not None:
+        return cached
+
+    llm = create_llm(streaming=False, temperature=0, json_mode=True)
 
     decision_info = artifact.get("decision") or {}
     artifact_name = (decision_info.get("name") or "").strip()
@@ -344,7 +441,9 @@ async def resolve_dmn_identity(artifact: Dict[str, Any], candidates: List[Dict[s
         name = (parsed.get("name") or artifact_name or "").strip()
         if decision == "UPDATE" and not rid:
             decision = "PASS"
-        return {"decision": decision if decision in ("PASS", "UPDATE") else "PASS", "id": rid, "name": name}
+        result = {"decision": decision if decision in ("PASS", "UPDATE") else "PASS", "id": rid, "name": name}
+        _identity_cache_set(cache_key, result)
+        return result
     except Exception as e:
         handle_error("DMN식별판단", e)
         return {"decision": "PASS", "id": None, "name": artifact_name}
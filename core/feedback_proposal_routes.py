@@ -19,22 +19,54 @@ openspec/changes/add-process-definition-apply design.md 참고).
 """
 
 import asyncio
+import os
 
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
-from typing import Any, Dict, Optional
+from typing import Any, Coroutine, Dict, Optional, Set
 
-from core.database import fetch_batch_by_id, fetch_proposed_batches, mark_target_decision, update_feedback_status
+from core.database import fetch_batch_by_id, fetch_proposed_batches, mark_target_decision, update_feedback_status_bulk
 from core.feedback_batch_manager import (
     apply_approved_proposal,
     apply_approved_dmn_target,
     apply_approved_process_definition_target,
 )
+from utils.logger import log
 
 router = APIRouter(prefix="/feedback-proposals", tags=["feedback-proposals"])
 
 _VALID_TARGET_TYPES = {"SKILL", "DMN_RULE", "PROCESS_DEFINITION"}
 
+# 응답과 무관하게 백그라운드로 넘긴 작업들. 이벤트 루프는 Task를 약한 참조로만 들고 있어
+# 참조를 따로 잡아두지 않으면 실행 도중 GC될 수 있으므로, 끝날 때까지 여기에 보관한다.
+_BACKGROUND_TASKS: Set[asyncio.Task] = set()
+
+# 서버 종료 시 백그라운드 작업을 기다리는 최대 시간(초)
+_DRAIN_TIMEOUT_SECONDS = float(os.getenv("BACKGROUND_DRAIN_TIMEOUT_SECONDS", "20"))
+
+
+def _spawn(coro: Coroutine[Any, Any, Any]) -> asyncio.Task:
+    task = asyncio.create_task(coro)
+    _BACKGROUND_TASKS.add(task)
+    task.add_done_callback(_BACKGROUND_TASKS.discard)
+    return task
+
+
+async def drain_background_tasks(timeout: float = _DRAIN_TIMEOUT_SECONDS) -> None:
+    """서버 종료 시 아직 진행 중인 백그라운드 작업(승인 반영)이 끝나길 기다린다.
+
+    Deep Agent 승인 실행은 몇 분씩 걸릴 수 있어 무한정 기다리면 오케스트레이터가 프로세스를
+    강제 종료할 때까지 종료가 멈춘다. timeout 안에 끝나지 않은 작업은 취소하고 개수를 남긴다.
+    """
+    if not _BACKGROUND_TASKS:
+        return
+    _, pending = await asyncio.wait(list(_BACKGROUND_TASKS), timeout=timeout)
+    if pending:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        log(f"⚠️ 종료 대기 {timeout:g}초 초과로 백그라운드 작업 {len(pending)}개를 취소했습니다")
+
 
 class DecisionBody(BaseModel):
     approver_id: Optional[str] = None
@@ -72,13 +104,17 @@ def _find_decided_target(
     return _find_target(after, target_type)
 
 
-def _all_targets_decided(batch: Dict[str, Any]) -> bool:
+def _all_targets_decided_none_approved(batch: Dict[str, Any]) -> bool:
+    """모든 target이 결정됐고(PENDING 없음) 그중 승인된 것이 하나도 없는지를 targets를
+    한 번만 훑어 판단한다 — PENDING이나 APPROVED를 만나는 즉시 False."""
     targets = batch.get("targets") or []
-    return bool(targets) and all((t.get("status") or "PENDING") != "PENDING" for t in targets)
-
-
-def _any_target_approved(batch: Dict[str, Any]) -> bool:
-    return any(t.get("status") == "APPROVED" for t in batch.get("targets") or [])
+    if not targets:
+        return False
+    for t in targets:
+        status = t.get("status") or "PENDING"
+        if status in ("PENDING", "APPROVED"):
+            return False
+    return True
 
 
 def _serialize_proposal(b: Dict[str, Any]) -> Dict[str, Any]:
@@ -143,7 +179,7 @@ async def approve_feedback_proposal_target(proposal_id: str, target_type: str, b
         skill_target = _find_decided_target(batch, updated, "SKILL") or {}
         extracted_rule = skill_target.get("artifact", "")
         bound_skill_name = skill_target.get("name")
-        asyncio.create_task(
+        _spawn(
             apply_approved_proposal(updated, extracted_rule, bound_skill_name, approver_id=body.approver_id)
         )
         return {"approved": True, "id": proposal_id, "target": target_type, "applied": True}
@@ -153,7 +189,7 @@ async def approve_feedback_proposal_target(proposal_id: str, target_type: str, b
         # 넘긴다 — 승인 응답은 target 결정 반영까지만 동기로 처리한다. dmn_target 자체
         # (id/name 포함)를 넘겨서 이미 승인된 매칭을 apply 단계에서 재판단하지 않는다.
         dmn_target = _find_decided_target(batch, updated, "DMN_RULE") or {}
-        asyncio.create_task(
+        _spawn(
             apply_approved_dmn_target(
                 updated,
                 dmn_target,
@@ -212,10 +248,10 @@ async def reject_feedback_proposal_target(proposal_id: str, target_type: str, bo
     # — 단일 target 시절의 "거절 시 배치 종료" 동작과 동일. 이미 승인된 target이 있으면
     # (예: SKILL은 승인, 다른 target은 거절) 그 target의 승인 결과가 이미 workitem 상태를
     # 처리했으므로 여기서 건드리지 않는다.
-    if _all_targets_decided(updated) and not _any_target_approved(updated):
-        for item in updated.get("collected_items") or []:
-            todo_id = item.get("todo_id")
-            if todo_id:
-                await update_feedback_status(todo_id, "REJECTED")
+    if _all_targets_decided_none_approved(updated):
+        await update_feedback_status_bulk(
+            [item.get("todo_id") for item in updated.get("collected_items") or []],
+            "REJECTED",
+        )
 
     return {"rejected": True, "id": proposal_id, "target": target_type}
@@ -3,6 +3,7 @@ Skill 커밋 모듈
 HTTP API를 통해 스킬을 저장/수정/삭제합니다.
 """
 
+import asyncio
 from typing import Dict, List, Optional
 from utils.logger import log, handle_error
 from core.database import (
@@ -74,7 +75,7 @@ async def commit_to_skill(
         reviewer_id: UPDATE 시 열리는 스킬 병합 요청의 reviewer(승인자).
     """
     try:
-        agent_info = _get_agent_by_id(agent_id) if agent_id else None
+        agent_info = await asyncio.to_thread(_get_agent_by_id, agent_id) if agent_id else None
         resolved_tenant_id = agent_info.get("tenant_id") if agent_info else tenant_id
 
         if operation in ("CREATE", "UPDATE") and skill_artifact is None:
@@ -104,7 +105,7 @@ async def commit_to_skill(
                 log(f"   ❌ SKILL 삭제 실패: {e}")
                 raise
 
-            _sync_skill_attribution(agent_id, activity_ref, skill_name, "DELETE")
+            await asyncio.to_thread(_sync_skill_attribution, agent_id, activity_ref, skill_name, "DELETE")
 
         if operation == "UPDATE":
             if not skill_name:
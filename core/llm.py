@@ -11,6 +11,7 @@ Setting `disable_streaming=True` forces the underlying model to not use streamin
 
 from __future__ import annotations
 
+from functools import lru_cache
 from typing import Dict, Optional, Tuple, Union
 import os
 
@@ -36,25 +37,54 @@ def create_llm(
     temperature: float = 0.0,
     timeout: Optional[TimeoutType] = (10.0, 120.0),  # connect, read
     max_retries: int = 6,
+    json_mode: bool = False,
 ):
     """
     Standard ChatOpenAI constructor wrapper used across the project.
-    """
-    from langchain_openai import ChatOpenAI
 
+    json_mode=True requests OpenAI JSON mode (response_format=json_object) so the
+    model is constrained to emit a single JSON object — use it for calls whose
+    prompt asks for "JSON only" and parses the reply with json.loads. The prompt
+    must mention JSON (an OpenAI requirement for this mode).
+
+    Instances are memoized per resolved configuration, so repeated calls reuse the
+    same client (and its HTTP connection pool) instead of building a new one per
+    request. Environment lookups still happen on every call, so changing the
+    proxy/model env vars is picked up on the next call.
+    """
     base_url = os.getenv("LLM_PROXY_URL", "http://litellm-proxy:4000")
     api_key = os.getenv("LLM_PROXY_API_KEY") or os.getenv("OPENAI_API_KEY", "")
     resolved_model = model or get_llm_model(default="gpt-4o")
 
+    return _cached_chat_openai(
+        base_url, api_key, resolved_model, temperature, timeout, max_retries, json_mode
+    )
+
+
+@lru_cache(maxsize=16)
+def _cached_chat_openai(
+    base_url: str,
+    api_key: str,
+    model: str,
+    temperature: float,
+    timeout: Optional[TimeoutType],
+    max_retries: int,
+    json_mode: bool,
+):
+    from langchain_openai import ChatOpenAI
+
+    model_kwargs = {"response_format": {"type": "json_object"}} if json_mode else {}
+
     return ChatOpenAI(
         base_url=base_url,
         api_key=api_key,
-        model=resolved_model,
+        model=model,
         temperature=temperature,
         streaming=False,
         disable_streaming=True,
         timeout=timeout,
         max_retries=max_retries,
+        model_kwargs=model_kwargs,
     )
 
 
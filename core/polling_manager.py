@@ -1,3 +1,4 @@
+import asyncio
 import json
 from typing import Dict, List, Any, Optional
 from utils.logger import log, handle_error
@@ -31,12 +32,15 @@ async def get_agents_info(user_ids: str, assignees: Optional[Any] = None) -> Lis
 
     if user_ids:
         ids = [uid.strip() for uid in user_ids.split(',')]
-        for user_id in ids:
-            agent_info = _get_agent_by_id(user_id)
+        # _get_agent_by_id는 동기 DB 호출이라 이벤트 루프를 막지 않도록 스레드에서 함께 조회한다.
+        infos = await asyncio.gather(*(asyncio.to_thread(_get_agent_by_id, uid) for uid in ids))
+        for user_id, agent_info in zip(ids, infos):
             if agent_info:
                 agent_list.append(agent_info)
                 found_agent_ids.add(user_id)
-                log(f"✅ user_id로 에이전트 찾음: {user_id}")
+        # 에이전트마다 로그를 남기지 않고 조회가 끝난 뒤 한 줄로 요약한다.
+        if agent_list:
+            log(f"✅ user_id로 에이전트 찾음: {', '.join(a.get('id', '') for a in agent_list)}")
 
     if not agent_list and assignees:
         try:
@@ -45,6 +49,7 @@ async def get_agents_info(user_ids: str, assignees: Optional[Any] = None) -> Lis
             else:
                 assignees_data = assignees
 
+            found_in_assignees = []
             if isinstance(assignees_data, list):
                 for assignee_item in assignees_data:
                     if isinstance(assignee_item, dict):
@@ -52,11 +57,13 @@ async def get_agents_info(user_ids: str, assignees: Optional[Any] = None) -> Lis
                         if isinstance(endpoint, list):
                             for endpoint_id in endpoint:
                                 if endpoint_id and endpoint_id not in found_agent_ids:
-                                    agent_info = _get_agent_by_id(endpoint_id)
+                                    agent_info = await asyncio.to_thread(_get_agent_by_id, endpoint_id)
                                     if agent_info:
                                         agent_list.append(agent_info)
                                         found_agent_ids.add(endpoint_id)
-                                        log(f"✅ assignees에서 에이전트 찾음: {endpoint_id}")
+                                        found_in_assignees.append(endpoint_id)
+            if found_in_assignees:
+                log(f"✅ assignees에서 에이전트 찾음: {', '.join(found_in_assignees)}")
         except Exception as e:
             log(f"⚠️ assignees 파싱 에러 (무시): {str(e)[:200]}...")
             handle_error("assignees파싱", e)
@@ -121,6 +128,8 @@ async def process_feedback_task(row: Dict):
         log(f"학습 후보 생성 완료: {len(agent_feedbacks)}개")
 
         had_any_error = False
+        # 매칭 결과의 agent_id는 방금 조회한 agents 중 하나이므로 다시 조회하지 않는다.
+        agents_by_id = {a.get('id'): a for a in agents}
         for feedback_item in agent_feedbacks:
             agent_id = feedback_item.get('agent_id')
             agent_name = feedback_item.get('agent_name', 'Unknown')
@@ -130,7 +139,7 @@ async def process_feedback_task(row: Dict):
                 log(f"⚠️ 에이전트 {agent_name}의 학습 후보가 비어있음, 건너뜀")
                 continue
 
-            agent_info = _get_agent_by_id(agent_id)
+            agent_info = agents_by_id.get(agent_id) or await asyncio.to_thread(_get_agent_by_id, agent_id)
             if not agent_info:
                 log(f"⚠️ 에이전트 정보 없음: {agent_id}")
                 continue
@@ -24,11 +24,37 @@ load_dotenv()
 SKILL_API_BASE_URL = os.getenv("SKILL_API_BASE_URL", "http://localhost:8888")
 
 
+class SkillApiError(Exception):
+    """스킬 HTTP API 요청 실패.
+
+    호출부가 메시지 문자열을 파싱하지 않고도 원인을 구분할 수 있도록 HTTP 상태 코드
+    (응답을 받지 못한 경우 None)와 서버가 돌려준 detail을 속성으로 담는다.
+    """
+
+    def __init__(self, message: str, status_code: Optional[int] = None, detail: Any = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.detail = detail
+
+
+# 스킬 API 호출은 모두 같은 호스트로 가므로 세션을 공유해 TCP/TLS 연결을 재사용한다.
+# (requests.request는 호출마다 새 세션을 만들고 닫아 매번 연결을 새로 맺는다.)
+_session: Optional[requests.Session] = None
+
+
 def _get_base_url() -> str:
     """HTTP API 기본 URL 반환"""
     return SKILL_API_BASE_URL
 
 
+def _get_session() -> requests.Session:
+    """스킬 API용 공유 HTTP 세션 반환 (최초 호출 시 생성)"""
+    global _session
+    if _session is None:
+        _session = requests.Session()
+    return _session
+
+
 def _make_request(
     method: str,
     endpoint: str,
@@ -62,13 +88,13 @@ def _make_request(
     
     Raises
     ------
-    requests.RequestException
-        HTTP 요청 실패 시
+    SkillApiError
+        HTTP 요청 실패 시 (status_code/detail 포함)
     """
     url = f"{_get_base_url()}{endpoint}"
     
     try:
-        response = requests.request(
+        response = _get_session().request(
             method=method,
             url=url,
             params=params,
@@ -88,10 +114,20 @@ def _make_request(
             
     except requests.exceptions.RequestException as e:
         handle_error(f"HTTP요청실패_{method}_{endpoint}", e)
-        if hasattr(e.response, "json"):
-            error_detail = e.response.json()
-            raise Exception(f"API 요청 실패: {error_detail.get('detail', str(e))}")
-        raise Exception(f"API 요청 실패: {str(e)}")
+        resp = getattr(e, "response", None)
+        status_code = getattr(resp, "status_code", None)
+        detail = None
+        if resp is not None:
+            try:
+                error_detail = resp.json()
+                detail = error_detail.get("detail") if isinstance(error_detail, dict) else None
+            except ValueError:
+                detail = None
+        raise SkillApiError(
+            f"API 요청 실패: {detail if detail is not None else str(e)}",
+            status_code=status_code,
+            detail=detail,
+        ) from e
 
 
 def create_skill_zip(skill_name: str, skill_content: str, additional_files: Optional[Dict[str, str]] = None) -> io.BytesIO:
@@ -3,13 +3,13 @@ Deep Agent용 스킬 도구 정의
 피드백 기반 스킬 개선에 필요한 도구만 제공 (HTTP API 전용)
 """
 
+import asyncio
 import json
 from typing import Any, Dict, List, Optional
 
 from langchain_core.tools import tool
 from utils.logger import log, handle_error
 from core.skill_api_client import (
-    check_skill_exists_with_info,
     get_skill_file_content,
     get_skill_files,
     list_uploaded_skills,
@@ -58,6 +58,43 @@ def create_skill_tools(
     (fix-merge-request-requester).
     """
 
+    # 바인딩된 에이전트 행은 도구 세트 수명(에이전트 실행 1회) 동안 한 번만 조회한다 —
+    # 도구 호출마다 users를 다시 읽지 않도록. 에이전트 skills를 바꾸는 도구는 무효화한다.
+    # 조회 실패(None)는 담아두지 않아 다음 도구 호출에서 다시 조회한다.
+    agent_cache: Dict[str, Any] = {}
+
+    async def _bound_agent_info() -> Optional[Dict[str, Any]]:
+        if not agent_id:
+            return None
+        cached = agent_cache.get("info")
+        if cached is not None:
+            return cached
+        from core.database import _get_agent_by_id
+
+        # 동기 DB 호출이라 이벤트 루프를 막지 않도록 스레드에서 조회한다.
+        info = await asyncio.to_thread(_get_agent_by_id, agent_id)
+        if info is not None:
+            agent_cache["info"] = info
+        return info
+
+    # 업로드된 스킬 목록(이름 → 항목)도 실행 동안 테넌트별로 한 번만 받아 search_similar_skills와
+    # get_skill_detail이 공유한다. 스킬을 바꾸는 commit_to_skill 이후에는 다시 받는다.
+    # 목록 조회 실패와 빈 목록을 구분할 수 없으므로 빈 결과는 담아두지 않는다.
+    skills_cache: Dict[str, Dict[str, Dict[str, Any]]] = {}
+
+    def _uploaded_skills_by_name(tenant_id: str) -> Dict[str, Dict[str, Any]]:
+        cached = skills_cache.get(tenant_id)
+        if cached is not None:
+            return cached
+        by_name: Dict[str, Dict[str, Any]] = {}
+        for s in list_uploaded_skills(tenant_id):
+            name = s.get("name")
+            if name:
+                by_name.setdefault(name, s)
+        if by_name:
+            skills_cache[tenant_id] = by_name
+        return by_name
+
     @tool
     async def search_similar_skills(content: str, threshold: float = 0.7) -> str:
         """
@@ -69,13 +106,10 @@ def create_skill_tools(
             threshold: 유사도 임계값 (0.0-1.0)
         """
         try:
-            from core.database import (
-                _get_agent_by_id,
-                load_activity_skills,
-            )
+            from core.database import load_activity_skills
 
             if agent_id:
-                agent_info = _get_agent_by_id(agent_id)
+                agent_info = await _bound_agent_info()
                 tenant_id = agent_info.get("tenant_id") if agent_info else None
                 bound_names = _parse_comma_separated_list(agent_info.get("skills") if agent_info else None)
             else:
@@ -87,43 +121,26 @@ def create_skill_tools(
                     activity_id=ref.get("activity_id", ""),
                 )
 
-            results: List[Dict] = []
-            skill_names_found: set = set()
-
-            # HTTP API로 업로드된 스킬 목록 조회
-            uploaded_skills_set: set = set()
+            # HTTP API로 업로드된 스킬 목록의 이름 → 항목 인덱스(_uploaded_skills_by_name)를 쓴다.
+            # check_skill_exists_with_info는 호출마다 같은 목록을 다시 받아 선형 탐색하므로
+            # 스킬마다 부르면 목록 조회가 O(N)번 반복된다. 귀속 대상(에이전트 또는 활동)에
+            # 이미 있는 스킬도 같은 목록에서 확인하고, 결과 목록 앞쪽에 먼저 보여준다.
             try:
-                uploaded_skills = list_uploaded_skills(tenant_id or "")
-                uploaded_skills_set = {s.get("name", "") for s in uploaded_skills if s.get("name")}
+                skills_by_name = _uploaded_skills_by_name(tenant_id or "")
             except Exception:
-                pass
-
-            # 귀속 대상(에이전트 또는 활동)에 이미 있는 스킬도 확인
-            for sn in bound_names:
-                if sn not in uploaded_skills_set:
-                    try:
-                        info = check_skill_exists_with_info(sn, tenant_id or "")
-                        if info and info.get("exists"):
-                            uploaded_skills_set.add(sn)
-                    except Exception:
-                        pass
-
-            # 각 스킬의 상세 정보 조회
-            for sn in uploaded_skills_set:
-                if sn in skill_names_found:
-                    continue
-                try:
-                    info = check_skill_exists_with_info(sn, tenant_id or "")
-                    if info and info.get("exists"):
-                        results.append({
-                            "id": sn,
-                            "name": info.get("name", sn),
-                            "description": info.get("description", ""),
-                            "verified": True,
-                        })
-                        skill_names_found.add(sn)
-                except Exception:
-                    pass
+                skills_by_name = {}
+
+            results: List[Dict] = [
+                {
+                    "id": sn,
+                    "name": info.get("name", sn),
+                    "description": info.get("description", ""),
+                    "verified": True,
+                }
+                for sn, info in skills_by_name.items()
+            ]
+            bound_set = set(bound_names)
+            results.sort(key=lambda item: item["id"] not in bound_set)
 
             if not results:
                 return f"관련된 기존 스킬이 없습니다. (검색 임계값: {threshold})\n새 스킬을 생성할지 판단하세요."
@@ -165,16 +182,15 @@ def create_skill_tools(
             output_lines = [f"📄 스킬 상세 조회: {skill_name}\n"]
 
             if agent_id:
-                from core.database import _get_agent_by_id
-                agent_info = _get_agent_by_id(agent_id)
+                agent_info = await _bound_agent_info()
                 tenant_id = agent_info.get("tenant_id") if agent_info else ""
             else:
                 tenant_id = (activity_ref or {}).get("tenant_id", "")
 
             # HTTP API 조회
             try:
-                info = check_skill_exists_with_info(skill_name, tenant_id or "")
-                if not info or not info.get("exists"):
+                info = _uploaded_skills_by_name(tenant_id or "").get(skill_name)
+                if not info:
                     return f"❌ 스킬을 찾을 수 없습니다: {skill_name}"
 
                 file_info = get_skill_file_content(skill_name, "SKILL.md", tenant_id or "")
@@ -280,16 +296,22 @@ def create_skill_tools(
                     "additional_files": parsed_files or {},
                 }
 
-            await _commit(
-                agent_id=agent_id,
-                skill_artifact=skill_artifact,
-                operation=operation,
-                skill_id=skill_id,
-                tenant_id=(activity_ref or {}).get("tenant_id") if not agent_id else None,
-                activity_ref=activity_ref if not agent_id else None,
-                requester_ids=requester_ids,
-                reviewer_id=reviewer_id,
-            )
+            try:
+                await _commit(
+                    agent_id=agent_id,
+                    skill_artifact=skill_artifact,
+                    operation=operation,
+                    skill_id=skill_id,
+                    tenant_id=(activity_ref or {}).get("tenant_id") if not agent_id else None,
+                    activity_ref=activity_ref if not agent_id else None,
+                    requester_ids=requester_ids,
+                    reviewer_id=reviewer_id,
+                )
+            finally:
+                skills_cache.clear()
+                if operation == "DELETE":
+                    # 삭제는 에이전트 skills에서도 스킬을 빼므로 바인딩된 에이전트 행을 다시 읽게 한다.
+                    agent_cache.pop("info", None)
 
             owner_label = f"에이전트: {agent_id}" if agent_id else f"활동: {activity_ref}"
             msgs = {
@@ -312,30 +334,28 @@ def create_skill_tools(
             skill_ids: 에이전트에 적재할 스킬 이름 (쉼표 구분, 예: 'skill-a, skill-b')
         """
         try:
-            from core.database import (
-                _get_agent_by_id,
-                update_agent_and_tenant_skills,
-            )
+            from core.database import update_agent_and_tenant_skills_bulk
 
             skill_names = _parse_skill_ids_input(skill_ids)
             if not skill_names:
                 return "❌ skill_ids가 비어있습니다."
 
-            agent_info = _get_agent_by_id(agent_id)
+            agent_info = await _bound_agent_info()
             if not agent_info:
                 return f"❌ 에이전트를 찾을 수 없습니다: {agent_id}"
 
-            attached = []
-            for sn in skill_names[:10]:
-                try:
-                    update_agent_and_tenant_skills(agent_id, sn, "CREATE")
-                    attached.append(sn)
-                    log(f"✅ 스킬 적재 완료: {sn} (agent_id={agent_id})")
-                except Exception as e:
-                    log(f"⚠️ 스킬 적재 실패 ({sn}): {e}")
-
-            if not attached:
+            # 스킬마다 users/tenants/agent_skills를 따로 갱신하지 않고 한 번에 동기화한다.
+            attached = skill_names[:10]
+            try:
+                # 동기 DB 호출(users/tenants/agent_skills)이라 이벤트 루프를 막지 않도록 스레드에서 실행한다.
+                await asyncio.to_thread(update_agent_and_tenant_skills_bulk, agent_id, attached, "CREATE")
+            except Exception as e:
+                agent_cache.pop("info", None)
+                log(f"⚠️ 스킬 적재 실패 ({', '.join(attached)}): {e}")
                 return f"❌ 스킬 적재 실패: {', '.join(skill_names)}"
+
+            agent_cache.pop("info", None)
+            log(f"✅ 스킬 적재 완료: {', '.join(attached)} (agent_id={agent_id})")
             return f"✅ 기존 스킬 {len(attached)}개를 에이전트에 적재했습니다: {', '.join(attached)}"
         except Exception as e:
             handle_error("attach_skills_to_agent", e)
@@ -38,7 +38,7 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from core.polling_manager import initialize_connections
 from core.feedback_batch_manager import start_feedback_batch_collection, start_feedback_batch_trigger
-from core.feedback_proposal_routes import router as feedback_proposals_router
+from core.feedback_proposal_routes import drain_background_tasks, router as feedback_proposals_router
 from utils.logger import log
 
 
@@ -64,6 +64,7 @@ async def lifespan(app: FastAPI):
             pass
         except Exception as e:
             log(f"⚠️ 폴링 작업 종료 중 에러 (무시): {str(e)[:200]}...")
+    await drain_background_tasks()
     log("서버 종료")
 
 app = FastAPI(
@@ -0,0 +1,64 @@
+"""
+_get_agent_by_id 캐시 테스트 — TTL 안에서는 users를 다시 조회하지 않고, 조회 실패는
+캐시하지 않으며, 무효화 후에는 다시 조회하는지 검증한다.
+
+대상 모듈:
+- core.database._get_agent_by_id
+"""
+
+import sys
+import os
+import pytest
+from unittest.mock import patch, MagicMock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import database
+from core.database import _get_agent_by_id, _invalidate_agent_cache
+
+
+def _client_returning(rows):
+    client = MagicMock()
+    client.table.return_value.select.return_value.eq.return_value.execute.return_value = MagicMock(data=rows)
+    return client
+
+
+_AGENT_ROW = {"id": "agent-1", "username": "에이전트1", "is_agent": True, "agent_type": "agent"}
+
+
+@pytest.fixture(autouse=True)
+def _clear_agent_cache():
+    database._agent_cache.clear()
+    yield
+    database._agent_cache.clear()
+
+
+class TestAgentCache:
+    def test_repeated_lookup_hits_cache(self):
+        client = _client_returning([dict(_AGENT_ROW)])
+
+        with patch("core.database.get_db_client", return_value=client):
+            first = _get_agent_by_id("agent-1")
+            second = _get_agent_by_id("agent-1")
+
+        assert first["name"] == second["name"] == "에이전트1"
+        assert client.table.call_count == 1
+
+    def test_missing_agent_not_cached(self):
+        client = _client_returning([])
+
+        with patch("core.database.get_db_client", return_value=client):
+            assert _get_agent_by_id("agent-1") is None
+            assert _get_agent_by_id("agent-1") is None
+
+        assert client.table.call_count == 2
+
+    def test_invalidate_forces_requery(self):
+        client = _client_returning([dict(_AGENT_ROW)])
+
+        with patch("core.database.get_db_client", return_value=client):
+            _get_agent_by_id("agent-1")
+            _invalidate_agent_cache("agent-1")
+            _get_agent_by_id("agent-1")
+
+        assert client.table.call_count == 2
@@ -0,0 +1,99 @@
+"""
+resolve_*_identity 판단 결과 캐시 테스트 — 같은 입력이면 LLM을 다시 호출하지 않고,
+후보 목록이 바뀌거나 폴백 결과일 때는 재사용하지 않는지, 비교할 후보가 없으면 LLM
+호출 없이 PASS를 반환하는지 검증한다.
+
+대상 모듈:
+- core.feedback_processor.resolve_skill_identity
+- core.feedback_processor.resolve_dmn_identity
+"""
+
+import sys
+import os
+import pytest
+from unittest.mock import patch, AsyncMock, MagicMock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import feedback_processor
+from core.feedback_processor import resolve_skill_identity, resolve_dmn_identity
+
+
+def _llm_returning(content):
+    llm = MagicMock()
+    llm.ainvoke = AsyncMock(return_value=MagicMock(content=content))
+    return llm
+
+
+@pytest.fixture(autouse=True)
+def _clear_identity_cache():
+    feedback_processor._identity_cache.clear()
+    yield
+    feedback_processor._identity_cache.clear()
+
+
+class TestIdentityCache:
+    @pytest.mark.asyncio
+    async def test_same_skill_input_reuses_result(self):
+        llm = _llm_returning('{"decision": "UPDATE", "name": "기존-스킬"}')
+        candidates = [{"name": "기존-스킬", "description": "설명"}]
+
+        with patch("core.feedback_processor.create_llm", return_value=llm):
+            first = await resolve_skill_identity("절차 규칙", candidates)
+            second = await resolve_skill_identity("절차 규칙", candidates)
+
+        assert first == second == {"decision": "UPDATE", "name": "기존-스킬"}
+        assert llm.ainvoke.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_changed_candidates_miss_cache(self):
+        llm = _llm_returning('{"decision": "UPDATE", "name": "기존-스킬"}')
+
+        with patch("core.feedback_processor.create_llm", return_value=llm):
+            await resolve_skill_identity("절차 규칙", [{"name": "기존-스킬", "description": "v1"}])
+            await resolve_skill_identity("절차 규칙", [{"name": "기존-스킬", "description": "v2"}])
+
+        assert llm.ainvoke.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_fallback_result_not_cached(self):
+        llm = _llm_returning("JSON이 아닌 응답")
+        artifact = {"decision": {"name": "결정1"}}
+
+        with patch("core.feedback_processor.create_llm", return_value=llm):
+            first = await resolve_dmn_identity(artifact, [{"id": "dmn1", "name": "결정1"}])
+            await resolve_dmn_identity(artifact, [{"id": "dmn1", "name": "결정1"}])
+
+        assert first == {"decision": "PASS", "id": None, "name": "결정1"}
+        assert llm.ainvoke.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_cached_result_is_a_copy(self):
+        llm = _llm_returning('{"decision": "UPDATE", "id": "dmn1", "name": "결정1"}')
+        artifact = {"decision": {"name": "결정1"}}
+        candidates = [{"id": "dmn1", "name": "결정1"}]
+
+        with patch("core.feedback_processor.create_llm", return_value=llm):
+            first = await resolve_dmn_identity(artifact, candidates)
+            first["id"] = "변조"
+            second = await resolve_dmn_identity(artifact, candidates)
+
+        assert second["id"] == "dmn1"
+
+
+class TestEmptyCandidatesSkipLlm:
+    @pytest.mark.asyncio
+    async def test_skill_without_candidates_passes_without_llm(self):
+        with patch("core.feedback_processor.create_llm") as mock_create_llm:
+            resolved = await resolve_skill_identity("절차 규칙", [])
+
+        assert resolved == {"decision": "PASS", "name": ""}
+        mock_create_llm.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_dmn_without_candidates_passes_without_llm(self):
+        with patch("core.feedback_processor.create_llm") as mock_create_llm:
+            resolved = await resolve_dmn_identity({"decision": {"name": " 결정1 "}}, [])
+
+        assert resolved == {"decision": "PASS", "id": None, "name": "결정1"}
+        mock_create_llm.assert_not_called()
@@ -46,7 +46,7 @@ class TestDmnMergeRequestAttribution:
     @patch("core.feedback_batch_manager.merge_dmn_artifact_into_definition", return_value={})
     @patch("core.feedback_batch_manager._get_dmn_definition_from_xml", return_value={})
     @patch("core.feedback_batch_manager.resolve_dmn_identity", new_callable=AsyncMock, return_value=_RESOLVED_UPDATE)
-    @patch("core.feedback_batch_manager.list_agent_dmn_rules", return_value=_CANDIDATES)
+    @patch("core.feedback_batch_manager.list_dmn_rules_by_agents", return_value={"agent-1": _CANDIDATES})
     @patch("core.feedback_batch_manager.match_feedback_to_agents", new_callable=AsyncMock, return_value=_MATCHING)
     @patch("core.feedback_batch_manager.get_agents_info", new_callable=AsyncMock, return_value=_AGENTS)
     @patch("core.feedback_batch_manager.fetch_todolist_rows_by_ids", new_callable=AsyncMock, return_value=[])
@@ -91,7 +91,7 @@ class TestDmnMergeRequestAttribution:
     @patch("core.feedback_batch_manager.merge_dmn_artifact_into_definition", return_value={})
     @patch("core.feedback_batch_manager._get_dmn_definition_from_xml", return_value={})
     @patch("core.feedback_batch_manager.resolve_dmn_identity", new_callable=AsyncMock, return_value=_RESOLVED_UPDATE)
-    @patch("core.feedback_batch_manager.list_agent_dmn_rules", return_value=_CANDIDATES)
+    @patch("core.feedback_batch_manager.list_dmn_rules_by_agents", return_value={"agent-1": _CANDIDATES})
     @patch("core.feedback_batch_manager.match_feedback_to_agents", new_callable=AsyncMock, return_value=_MATCHING)
     @patch("core.feedback_batch_manager.get_agents_info", new_callable=AsyncMock, return_value=_AGENTS)
     @patch("core.feedback_batch_manager.fetch_todolist_rows_by_ids", new_callable=AsyncMock, return_value=[])
@@ -142,7 +142,7 @@ class TestDmnMergeRequestAttribution:
     @pytest.mark.asyncio
     @patch("core.feedback_batch_manager.insert_dmn_merge_request")
     @patch("core.feedback_batch_manager.resolve_dmn_identity", new_callable=AsyncMock, return_value={"decision": "PASS", "id": None, "name": "결정1"})
-    @patch("core.feedback_batch_manager.list_agent_dmn_rules", return_value=[])
+    @patch("core.feedback_batch_manager.list_dmn_rules_by_agents", return_value={})
     @patch("core.feedback_batch_manager.match_feedback_to_agents", new_callable=AsyncMock, return_value=_MATCHING)
     @patch("core.feedback_batch_manager.get_agents_info", new_callable=AsyncMock, return_value=_AGENTS)
     @patch("core.feedback_batch_manager.fetch_todolist_rows_by_ids", new_callable=AsyncMock, return_value=[])
@@ -165,7 +165,7 @@ class TestDmnMergeRequestAttribution:
     @patch("core.feedback_batch_manager.merge_dmn_artifact_into_definition", return_value={})
     @patch("core.feedback_batch_manager._get_dmn_definition_from_xml", return_value={})
     @patch("core.feedback_batch_manager.resolve_dmn_identity", new_callable=AsyncMock, return_value={"decision": "PASS", "id": None, "name": "결정1"})
-    @patch("core.feedback_batch_manager.list_agent_dmn_rules", return_value=_CANDIDATES)
+    @patch("core.feedback_batch_manager.list_dmn_rules_by_agents", return_value={"agent-1": _CANDIDATES})
     @patch("core.feedback_batch_manager.match_feedback_to_agents", new_callable=AsyncMock, return_value=_MATCHING)
     @patch("core.feedback_batch_manager.get_agents_info", new_callable=AsyncMock, return_value=_AGENTS)
     @patch("core.feedback_batch_manager.fetch_todolist_rows_by_ids", new_callable=AsyncMock, return_value=[])
@@ -205,7 +205,7 @@ class TestDmnMergeRequestAttribution:
     @patch("core.feedback_batch_manager.insert_dmn_merge_request")
     @patch("core.feedback_batch_manager._get_dmn_definition_from_xml", return_value=None)
     @patch("core.feedback_batch_manager.resolve_dmn_identity", new_callable=AsyncMock, return_value=_RESOLVED_UPDATE)
-    @patch("core.feedback_batch_manager.list_agent_dmn_rules", return_value=_CANDIDATES)
+    @patch("core.feedback_batch_manager.list_dmn_rules_by_agents", return_value={"agent-1": _CANDIDATES})
     @patch("core.feedback_batch_manager.match_feedback_to_agents", new_callable=AsyncMock, return_value=_MATCHING)
     @patch("core.feedback_batch_manager.get_agents_info", new_callable=AsyncMock, return_value=_AGENTS)
     @patch("core.feedback_batch_manager.fetch_todolist_rows_by_ids", new_callable=AsyncMock, return_value=[])
@@ -0,0 +1,89 @@
+"""
+update_agent_and_tenant_skills_bulk의 users→tenants 임베드 조회 테스트 — 임베드가 되면
+tenants를 따로 조회하지 않고, 관계 오류(PGRST200/201)일 때만 개별 조회로 전환하며 그 밖의
+오류는 임베드를 끄지 않고 그대로 올리는지 검증한다.
+
+대상 모듈:
+- core.database.update_agent_and_tenant_skills_bulk
+"""
+
+import sys
+import os
+import pytest
+from unittest.mock import patch, MagicMock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import database
+from core.database import update_agent_and_tenant_skills_bulk
+
+
+class _ApiError(Exception):
+    """postgrest APIError처럼 code 속성을 가진 예외."""
+
+    def __init__(self, code):
+        super().__init__(code)
+        self.code = code
+
+
+def _client_with_reads(*results):
+    client = MagicMock()
+    client.table.return_value.select.return_value.eq.return_value.single.return_value.execute.side_effect = list(results)
+    return client
+
+
+def _updates(client):
+    return [c.args[0] for c in client.table.return_value.update.call_args_list]
+
+
+@pytest.fixture(autouse=True)
+def _reset_embed_flag():
+    database._users_tenant_embed_enabled = True
+    database._agent_cache.clear()
+    yield
+    database._users_tenant_embed_enabled = True
+
+
+class TestTenantEmbed:
+    def test_embedded_tenant_skips_separate_select(self):
+        client = _client_with_reads(
+            MagicMock(data={"id": "a", "tenant_id": "t", "skills": "x", "tenants": {"id": "t", "skills": ["x"]}}),
+        )
+
+        with patch("core.database.get_db_client", return_value=client):
+            update_agent_and_tenant_skills_bulk("a", ["y"], "CREATE")
+
+        assert _updates(client) == [{"skills": "x,y"}, {"skills": ["x", "y"]}]
+
+    def test_failed_embed_falls_back_to_plain_selects(self):
+        client = _client_with_reads(
+            _ApiError("PGRST200"),
+            MagicMock(data={"id": "a", "tenant_id": "t", "skills": "x"}),
+            MagicMock(data={"id": "t", "skills": ["x"]}),
+        )
+
+        with patch("core.database.get_db_client", return_value=client):
+            update_agent_and_tenant_skills_bulk("a", ["y"], "CREATE")
+
+        assert _updates(client) == [{"skills": "x,y"}, {"skills": ["x", "y"]}]
+        assert database._users_tenant_embed_enabled is False
+
+    def test_missing_agent_keeps_embed_enabled(self):
+        client = _client_with_reads(_ApiError("PGRST116"))
+
+        with patch("core.database.get_db_client", return_value=client):
+            with pytest.raises(_ApiError):
+                update_agent_and_tenant_skills_bulk("a", ["y"], "CREATE")
+
+        assert _updates(client) == []
+        assert database._users_tenant_embed_enabled is True
+
+    def test_network_error_keeps_embed_enabled(self):
+        client = _client_with_reads(ConnectionError("timeout"))
+
+        with patch("core.database.get_db_client", return_value=client):
+            with pytest.raises(ConnectionError):
+                update_agent_and_tenant_skills_bulk("a", ["y"], "CREATE")
+
+        assert _updates(client) == []
+        assert database._users_tenant_embed_enabled is True
@@ -7,6 +7,7 @@
 - core.feedback_batch_manager._process_triggered_batch
 """
 
+import asyncio
 import sys
 import os
 import pytest
@@ -123,7 +124,7 @@ class TestFillTargetIdentityDropsCreate:
 
 class TestProcessTriggeredBatchDiscardsWhenNothingSurvives:
     @pytest.mark.asyncio
-    @patch("core.feedback_batch_manager.update_feedback_status", new_callable=AsyncMock)
+    @patch("core.feedback_batch_manager.update_feedback_status_bulk", new_callable=AsyncMock)
     @patch("core.feedback_batch_manager.mark_batch_discarded", new_callable=AsyncMock, return_value=True)
     @patch("core.feedback_batch_manager.mark_batch_proposed", new_callable=AsyncMock)
     @patch("core.feedback_batch_manager._fill_target_identity", new_callable=AsyncMock, return_value=False)
@@ -139,7 +140,7 @@ class TestProcessTriggeredBatchDiscardsWhenNothingSurvives:
 
         mock_proposed.assert_not_called()
         mock_discarded.assert_called_once()
-        mock_status.assert_called_once_with("todo1", "REJECTED")
+        mock_status.assert_called_once_with(["todo1"], "REJECTED")
 
     @pytest.mark.asyncio
     @patch("core.feedback_batch_manager.mark_batch_discarded", new_callable=AsyncMock, return_value=True)
@@ -165,3 +166,69 @@ class TestProcessTriggeredBatchDiscardsWhenNothingSurvives:
         mock_proposed.assert_called_once()
         _, kept_targets, _ = mock_proposed.call_args[0]
         assert [t["type"] for t in kept_targets] == ["SKILL"]
+
+    @pytest.mark.asyncio
+    @patch("core.feedback_batch_manager.mark_batch_discarded", new_callable=AsyncMock, return_value=True)
+    @patch("core.feedback_batch_manager.mark_batch_proposed", new_callable=AsyncMock, return_value=True)
+    @patch("core.feedback_batch_manager._fill_target_identity", new_callable=AsyncMock, return_value=True)
+    @patch(
+        "core.feedback_batch_manager.classify_and_extract_proposal",
+        new_callable=AsyncMock,
+        return_value=[
+            {"type": "SKILL", "artifact": "규칙"},
+            {"type": "SKILL", "artifact": "규칙"},
+            {"type": "DMN_RULE", "artifact": {"rules": [], "decision": {"name": "결정1"}}},
+            {"type": "DMN_RULE", "artifact": {"decision": {"name": "결정1"}, "rules": []}},
+        ],
+    )
+    async def test_duplicate_targets_are_resolved_once(
+        self, mock_classify, mock_fill_identity, mock_proposed, mock_discarded
+    ):
+        await _process_triggered_batch(_batch())
+
+        assert mock_fill_identity.await_count == 2
+        _, kept_targets, _ = mock_proposed.call_args[0]
+        assert [t["type"] for t in kept_targets] == ["SKILL", "DMN_RULE"]
+
+
+class TestFillTargetIdentitySharesRepresentativeAgent:
+    @pytest.mark.asyncio
+    @patch("core.feedback_batch_manager.resolve_dmn_identity", new_callable=AsyncMock, return_value={"decision": "UPDATE", "id": "dmn_existing", "name": "결정1"})
+    @patch("core.feedback_batch_manager.list_agent_dmn_rules", return_value=[{"id": "dmn_existing", "name": "결정1"}])
+    @patch("core.feedback_batch_manager.resolve_skill_identity", new_callable=AsyncMock, return_value={"decision": "UPDATE", "name": "기존-스킬"})
+    @patch("core.feedback_batch_manager._representative_agent", new_callable=AsyncMock, return_value={"id": "agent-1", "skills": "기존-스킬"})
+    @patch("core.feedback_batch_manager.fetch_todolist_rows_by_ids", new_callable=AsyncMock, return_value=[])
+    async def test_targets_of_one_batch_look_up_agent_once(
+        self, mock_rows, mock_rep_agent, mock_resolve_skill, mock_candidates, mock_resolve_dmn
+    ):
+        cache = {}
+        skill_target = {"type": "SKILL", "artifact": "규칙"}
+        dmn_target = {"type": "DMN_RULE", "artifact": {"decision": {"name": "결정1"}, "rules": []}}
+
+        assert await _fill_target_identity(_batch(), skill_target, cache) is True
+        assert await _fill_target_identity(_batch(), dmn_target, cache) is True
+
+        mock_rows.assert_called_once()
+        mock_rep_agent.assert_called_once()
+
+    @pytest.mark.asyncio
+    @patch("core.feedback_batch_manager.resolve_dmn_identity", new_callable=AsyncMock, return_value={"decision": "UPDATE", "id": "dmn_existing", "name": "결정1"})
+    @patch("core.feedback_batch_manager.list_agent_dmn_rules", return_value=[{"id": "dmn_existing", "name": "결정1"}])
+    @patch("core.feedback_batch_manager.resolve_skill_identity", new_callable=AsyncMock, return_value={"decision": "UPDATE", "name": "기존-스킬"})
+    @patch("core.feedback_batch_manager._representative_agent", new_callable=AsyncMock, return_value={"id": "agent-1", "skills": "기존-스킬"})
+    @patch("core.feedback_batch_manager.fetch_todolist_rows_by_ids", new_callable=AsyncMock, return_value=[])
+    async def test_concurrent_targets_share_one_agent_lookup(
+        self, mock_rows, mock_rep_agent, mock_resolve_skill, mock_candidates, mock_resolve_dmn
+    ):
+        cache = {}
+        skill_target = {"type": "SKILL", "artifact": "규칙"}
+        dmn_target = {"type": "DMN_RULE", "artifact": {"decision": {"name": "결정1"}, "rules": []}}
+
+        kept = await asyncio.gather(
+            _fill_target_identity(_batch(), skill_target, cache),
+            _fill_target_identity(_batch(), dmn_target, cache),
+        )
+
+        assert kept == [True, True]
+        mock_rows.assert_called_once()
+        mock_rep_agent.assert_called_once()